@@ -26,13 +26,16 @@ be used with other data classes.
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import logging
 
 import numpy
 import numpy.random
 
-from sherpa.astro.utils import calc_energy_flux
-from sherpa.utils import parallel_map
+from sherpa.astro.utils import calc_energy_flux, calc_photon_flux, \
+    _flux_grid, _flux_eval
+from sherpa.utils import parallel_map, _ncpus
 from sherpa.utils.err import ArgumentErr, FitErr, ModelErr
 from sherpa.sim import NormalParameterSampleFromScaleMatrix, \
     NormalParameterSampleFromScaleVector
@@ -46,8 +49,14 @@ __all__ = ['calc_flux', 'sample_flux', 'calc_sample_flux']
 class CalcFluxWorker():
     """Internal class for use by calc_flux.
 
-    We always return the full sample, even when only
-    a subset of them are needed to calculate the flux.
+    Only the flux is returned, since calc_flux already has the
+    samples; this keeps the amount of data sent back from the
+    worker processes to a minimum.
+
+    The integration grid does not depend on the parameter values,
+    so it is calculated once when method is calc_energy_flux or
+    calc_photon_flux and lo and hi are scalars. Otherwise method is
+    called for each sample.
     """
 
     def __init__(self, method, data, src, lo, hi, subset=None):
@@ -58,23 +67,76 @@ class CalcFluxWorker():
         self.hi = hi
         self.subset = subset
 
+        self.precomputed = method in (calc_energy_flux, calc_photon_flux) \
+            and numpy.ndim(lo) == 0 and numpy.ndim(hi) == 0
+        if self.precomputed:
+            eflux = method is calc_energy_flux
+            self.grid = _flux_grid(data, lo, hi, eflux=eflux)
+        else:
+            self.grid = None
+
     def __call__(self, sample):
         if self.subset is None:
             self.src.thawedpars = sample
         else:
             self.src.thawedpars = sample[self.subset]
 
-        flux = self.method(self.data, self.src, self.lo, self.hi)
-        return numpy.asarray([flux] + list(sample))
+        if self.precomputed:
+            flux = _flux_eval(self.src, self.grid)
+        else:
+            flux = self.method(self.data, self.src, self.lo, self.hi)
+
+        return flux
+
+    def run_chunk(self, samples):
+        """Calculate the fluxes using a copy of the source model.
+
+        This is used when the calculation is done with threads, as
+        each thread has to change the parameter values of its own
+        copy of the model.
+        """
+
+        worker = copy.copy(self)
+        worker.src = copy.deepcopy(self.src)
+        return [worker(sample) for sample in samples]
+
+
+def _thread_map(worker, samples, numcores=None):
+    """Run the worker on the samples using a pool of threads.
+
+    The samples are split into numcores chunks, and each chunk is
+    run in its own thread with its own copy of the source model.
+    """
+
+    if numcores is None:
+        numcores = _ncpus
+
+    # Threads do not need multiprocessing, so unlike parallel_map
+    # the _multi flag is not checked.
+    #
+    nsamples = len(samples)
+    numcores = min(numcores, nsamples)
+    if numcores < 2:
+        return [worker(sample) for sample in samples]
+
+    chunks = numpy.array_split(samples, numcores)
+    with ThreadPoolExecutor(max_workers=numcores) as pool:
+        results = pool.map(worker.run_chunk, chunks)
+
+    return [flux for chunk in results for flux in chunk]
 
 
 def calc_flux(data, src, samples, method=calc_energy_flux,
-              lo=None, hi=None, numcores=None, subset=None):
+              lo=None, hi=None, numcores=None, subset=None,
+              backend='process'):
     """Calculate model fluxes from a sample of parameter values.
 
     Given a set of parameter values, calculate the model flux for
     each set.
 
+    .. versionchanged:: 4.14.1
+       The backend parameter was added.
+
     .. versionchanged:: 4.12.2
        The subset parameter was added.
 
@@ -101,7 +163,9 @@ def calc_flux(data, src, samples, method=calc_energy_flux,
         If None then the lower edge of the data grid is used.
     hi : number or None, optional
         The upper edge of the dataspace range for the flux calculation.
-        If None then the upper edge of the data grid is used.
+        If None then the upper edge of the data grid is used. Only a
+        single band is supported, so an ArgumentErr is raised if lo
+        or hi is an array.
     numcores : int or None, optional
         Should the analysis be split across multiple CPU cores?
         When set to None all available cores are used.
@@ -112,6 +176,12 @@ def calc_flux(data, src, samples, method=calc_energy_flux,
         samples represented 'nh', 'gamma', and 'ampl' values for each
         row, but the src model only contained the 'gamma' and 'ampl'
         parameters then subset would be [1, 2].
+    backend : {'process', 'thread'}, optional
+        How is the calculation split across multiple CPU cores? The
+        default is to use separate processes. The 'thread' option
+        avoids the cost of starting the processes, and copying the
+        data to them, but is only useful when the model evaluation
+        releases the GIL.
 
     Returns
     -------
@@ -127,18 +197,35 @@ def calc_flux(data, src, samples, method=calc_energy_flux,
 
     """
 
+    if backend == 'process':
+        mapper = parallel_map
+    elif backend == 'thread':
+        mapper = _thread_map
+    else:
+        raise ArgumentErr('bad', 'backend', backend)
+
+    # Each sample has a single flux value.
+    #
+    for name, val in [('lo', lo), ('hi', hi)]:
+        if numpy.ndim(val) != 0:
+            raise ArgumentErr('bad', name, 'must be a number or None')
+
     old_vals = src.thawedpars
     worker = CalcFluxWorker(method, data, src, lo, hi, subset)
     try:
-        fluxes = parallel_map(worker, samples, numcores)
+        fluxes = mapper(worker, samples, numcores)
     finally:
         src.thawedpars = old_vals
 
-    return numpy.asarray(fluxes)
+    samples = numpy.asarray(samples)
+    vals = numpy.empty((samples.shape[0], samples.shape[1] + 1))
+    vals[:, 0] = fluxes
+    vals[:, 1:] = samples
+    return vals
 
 
 def _sample_flux_get_samples_with_scales(fit, src, correlated, scales,
-                                         num, clip='hard'):
+                                         num, clip='hard', rng=None):
     """Return the parameter samples given the parameter scales.
 
     Parameters
@@ -171,6 +258,9 @@ def _sample_flux_get_samples_with_scales(fit, src, correlated, scales,
         soft limits instead, and 'none' applies no clipping. The last
         column in the returned arrays indicates if the row had any
         clipped parameters (even when clip is set to 'none').
+    rng : numpy.random.Generator or None, optional
+        The random number generator to use. If None then the legacy
+        numpy.random functions are used.
 
     Returns
     -------
@@ -258,12 +348,13 @@ def _sample_flux_get_samples_with_scales(fit, src, correlated, scales,
     else:
         sampler = NormalParameterSampleFromScaleVector()
 
-    samples = sampler.get_sample(fit, scales, num=num)
+    samples = sampler.get_sample(fit, scales, num=num, rng=rng)
     clipped = sampler.clip(fit, samples, clip=clip)
     return samples, clipped
 
 
-def _sample_flux_get_samples(fit, src, correlated, num, clip='hard'):
+def _sample_flux_get_samples(fit, src, correlated, num, clip='hard',
+                             rng=None):
     """Return the parameter samples, using fit to define the scales.
 
     The covariance method is used to estimate the errors for the
@@ -292,6 +383,9 @@ def _sample_flux_get_samples(fit, src, correlated, num, clip='hard'):
         soft limits instead, and 'none' applies no clipping. The last
         column in the returned arrays indicates if the row had any
         clipped parameters (even when clip is set to 'none').
+    rng : numpy.random.Generator or None, optional
+        The random number generator to use. If None then the legacy
+        numpy.random functions are used.
 
     Returns
     -------
@@ -318,7 +412,7 @@ def _sample_flux_get_samples(fit, src, correlated, num, clip='hard'):
     else:
         sampler = NormalParameterSampleFromScaleVector()
 
-    samples = sampler.get_sample(fit, num=num)
+    samples = sampler.get_sample(fit, num=num, rng=rng)
     clipped = sampler.clip(fit, samples, clip=clip)
     return samples, clipped
 
@@ -369,7 +463,7 @@ def decompose(mdl):
 def sample_flux(fit, data, src,
                 method=calc_energy_flux, correlated=False,
                 num=1, lo=None, hi=None, numcores=None, samples=None,
-                clip='hard'):
+                clip='hard', rng=None, backend='process', out=None):
     """Calculate model fluxes from a sample of parameter values.
 
     Draw parameter values from a normal distribution and then calculate
@@ -377,6 +471,9 @@ def sample_flux(fit, data, src,
     drawn from normal distributions, and the distributions can either
     be independent or have correlations between the parameters.
 
+    .. versionchanged:: 4.14.1
+       The rng, backend, and out parameters were added.
+
     .. versionchanged:: 4.12.2
        The clip parameter was added and an extra column is added to
        the return to indicate if each row was clipped.
@@ -430,6 +527,18 @@ def sample_flux(fit, data, src,
         soft limits instead, and 'none' applies no clipping. The last
         column in the returned arrays indicates if the row had any
         clipped parameters (even when clip is set to 'none').
+    rng : numpy.random.Generator or None, optional
+        The random number generator to use. If None then the legacy
+        numpy.random functions are used.
+    backend : {'process', 'thread'}, optional
+        How is the flux calculation split across multiple CPU cores?
+        See calc_flux for more information.
+    out : 2D NumPy array or None, optional
+        If set, the array - of shape (num, nfree + 2) - which is filled
+        with the results and returned. This allows repeated calls to
+        re-use the same memory. The calculations are done at double
+        precision, but the array can use a smaller type, such as
+        numpy.float32, to reduce the memory used to store the results.
 
     Returns
     -------
@@ -438,7 +547,8 @@ def sample_flux(fit, data, src,
         number of free parameters in fit.model. Each row contains one
         iteration, and the columns are the calculated flux, followed
         by the free parameters, and then a flag column indicating if
-        the parameters were clipped (1) or not (0).
+        the parameters were clipped (1) or not (0). This is the out
+        array when it is set.
 
     See Also
     --------
@@ -484,16 +594,25 @@ def sample_flux(fit, data, src,
         raise ArgumentErr('bad', 'src',
                           'more free parameters than expected')
 
+    # The samplers accept a non-integer num, so convert it here to
+    # match.
+    #
+    num = int(num)
+    if out is not None and numpy.shape(out) != (num, mpar + 2):
+        raise ArgumentErr('bad', 'out',
+                          'must have shape ({}, {})'.format(num, mpar + 2))
+
     # The argument to sample_flux should really be called scales and
     # not samples.
     #
     scales = samples
     if scales is None:
         samples, clipped = _sample_flux_get_samples(fit, src, correlated,
-                                                    num, clip=clip)
+                                                    num, clip=clip, rng=rng)
     else:
         samples, clipped = _sample_flux_get_samples_with_scales(fit, src, correlated,
-                                                                scales, num, clip=clip)
+                                                                scales, num, clip=clip,
+                                                                rng=rng)
 
     # When a subset of the full model is used we need to know how
     # to select which rows in the samples array refer to the
@@ -523,8 +642,13 @@ def sample_flux(fit, data, src,
     # the boolean nature of this).
     #
     vals = calc_flux(data, src, samples, method, lo, hi, numcores,
-                     subset=cols)
-    return numpy.concatenate((vals, numpy.expand_dims(clipped, 1)), axis=1)
+                     subset=cols, backend=backend)
+    if out is None:
+        out = numpy.empty((num, mpar + 2), dtype=vals.dtype)
+
+    out[:, :-1] = vals
+    out[:, -1] = clipped
+    return out
 
 
 def calc_sample_flux(lo, hi, fit, data, samples, modelcomponent,
@@ -36,6 +36,8 @@ from sherpa.utils.err import ArgumentErr, ArgumentTypeErr, FitErr, \
     IdentifierErr, IOErr, ModelErr
 import sherpa.astro.utils
 from sherpa.astro import hc, charge_e
+from sherpa.astro.flux import CalcFluxWorker
+from sherpa.models.basic import PowLaw1D
 
 
 def fail(*arg):
@@ -225,6 +227,289 @@ def test_calc_flux_pha_density_bin_edges(clean_astro_ui):
     assert edens == pytest.approx(expected_edens)
 
 
+@pytest.mark.parametrize("method,calc",
+                         [(ui.sample_photon_flux, sherpa.astro.utils.calc_photon_flux),
+                          (ui.sample_energy_flux, sherpa.astro.utils.calc_energy_flux)])
+@pytest.mark.parametrize("lo,hi", [(None, None), (2.6, 7.8), (2.6, None),
+                                   (20, 30)])
+def test_sample_flux_pha_matches_calc(method, calc, lo, hi, clean_astro_ui):
+    """The sampled fluxes match the calc_xxx_flux values for each row.
+
+    This checks the case where the integration grid is only
+    calculated once, rather than for each row.
+    """
+
+    chans = np.arange(1, 11, 1, dtype=int)
+    counts = np.zeros(chans.size, dtype=int)
+
+    # "perfect" response
+    energies = np.arange(1, 12, 1)
+    elo, ehi = energies[:-1], energies[1:]
+    flat = np.ones(chans.size, dtype=int)
+
+    d = ui.DataPHA('example', chans, counts)
+    arf = ui.create_arf(elo, ehi, flat)
+    rmf = ui.create_rmf(elo, ehi, e_min=elo, e_max=elo, startchan=1,
+                        fname=None)
+
+    d.set_arf(arf)
+    d.set_rmf(rmf)
+    ui.set_data(1, d)
+
+    ui.set_source(ui.powlaw1d.pl)
+    pl.ampl = 1e-4
+    pl.gamma = 1.7
+
+    vals = method(lo=lo, hi=hi, num=10, scales=[0.1, 1e-5], numcores=1)
+    assert vals.shape == (10, 4)
+
+    for row in vals:
+        pl.gamma = row[1]
+        pl.ampl = row[2]
+        assert row[0] == pytest.approx(calc(d, pl, lo=lo, hi=hi))
+
+
+@pytest.mark.parametrize("calc",
+                         [sherpa.astro.utils.calc_photon_flux,
+                          sherpa.astro.utils.calc_energy_flux])
+def test_calc_flux_worker_bands(calc):
+    """The worker handles an array of bands.
+
+    The integration grid is only pre-computed for a single band.
+    """
+
+    chans = np.arange(1, 11, 1, dtype=int)
+    counts = np.zeros(chans.size, dtype=int)
+
+    # "perfect" response
+    energies = np.arange(1, 12, 1)
+    elo, ehi = energies[:-1], energies[1:]
+    flat = np.ones(chans.size, dtype=int)
+
+    d = ui.DataPHA('example', chans, counts)
+    arf = ui.create_arf(elo, ehi, flat)
+    rmf = ui.create_rmf(elo, ehi, e_min=elo, e_max=elo, startchan=1,
+                        fname=None)
+
+    d.set_arf(arf)
+    d.set_rmf(rmf)
+
+    pl = PowLaw1D()
+    pl.ampl = 1e-4
+    pl.gamma = 1.7
+
+    lo = [2.6, 3, 5]
+    hi = [7.8, 4, 9]
+    worker = CalcFluxWorker(calc, d, pl, lo, hi)
+    assert not worker.precomputed
+
+    flux = worker([1.2, 2e-4])
+    assert flux.shape == (3, )
+    assert flux == pytest.approx(calc(d, pl, lo=lo, hi=hi))
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_calc_flux_backend(backend, clean_astro_ui):
+    """The backend does not change the fluxes."""
+
+    from sherpa.astro.flux import calc_flux
+
+    chans = np.arange(1, 11, 1, dtype=int)
+    counts = np.zeros(chans.size, dtype=int)
+
+    # "perfect" response
+    energies = np.arange(1, 12, 1)
+    elo, ehi = energies[:-1], energies[1:]
+    flat = np.ones(chans.size, dtype=int)
+
+    d = ui.DataPHA('example', chans, counts)
+    arf = ui.create_arf(elo, ehi, flat)
+    rmf = ui.create_rmf(elo, ehi, e_min=elo, e_max=elo, startchan=1,
+                        fname=None)
+    d.set_arf(arf)
+    d.set_rmf(rmf)
+
+    pl = ui.create_model_component('powlaw1d', 'pl')
+    pl.ampl = 1e-4
+    pl.gamma = 1.7
+
+    samples = np.asarray([[1.5, 2e-4], [1.7, 1e-4], [1.9, 3e-4],
+                          [2.1, 5e-5], [1.2, 1e-5]])
+    vals = calc_flux(d, pl, samples, lo=2.6, hi=7.8, numcores=2,
+                     backend=backend)
+    assert vals.shape == (5, 3)
+    assert vals[:, 1:] == pytest.approx(samples)
+
+    expected = []
+    for gamma, ampl in samples:
+        pl.gamma = gamma
+        pl.ampl = ampl
+        expected.append(sherpa.astro.utils.calc_energy_flux(d, pl, 2.6, 7.8))
+
+    assert vals[:, 0] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+@pytest.mark.parametrize("lo,hi,name",
+                         [([0.5, 1], [2, 3], "lo"),
+                          (0.5, [2, 3], "hi")])
+def test_calc_flux_bands_not_supported(backend, lo, hi, name):
+    """calc_flux only calculates a single band."""
+
+    from sherpa.astro.flux import calc_flux
+
+    d = ui.Data1DInt('example', [1, 2, 3], [2, 3, 4], [1, 2, 3])
+    pl = PowLaw1D()
+    samples = np.asarray([[1.5, 2e-4], [1.7, 1e-4]])
+
+    with pytest.raises(ArgumentErr) as exc:
+        calc_flux(d, pl, samples, lo=lo, hi=hi, backend=backend)
+
+    assert str(exc.value) == f"Invalid {name}: 'must be a number or None'"
+
+
+def test_thread_map_without_multiprocessing(monkeypatch):
+    """The thread backend does not depend on multiprocessing."""
+
+    from sherpa.astro import flux
+
+    # Make sure that a check of _multi, either in sherpa.utils or the
+    # copy imported into the flux module, would fail.
+    #
+    monkeypatch.setattr(sherpa.utils, '_multi', False)
+    monkeypatch.setattr(flux, '_multi', False, raising=False)
+
+    class Worker:
+        def __init__(self):
+            self.nchunks = 0
+
+        def __call__(self, sample):
+            return sample.sum()
+
+        def run_chunk(self, samples):
+            self.nchunks += 1
+            return [self(sample) for sample in samples]
+
+    worker = Worker()
+    samples = np.arange(12).reshape(6, 2)
+    assert flux._thread_map(worker, samples, numcores=3) == \
+        pytest.approx([1, 5, 9, 13, 17, 21])
+    assert worker.nchunks == 3
+
+    # A single core does not use the threads
+    worker = Worker()
+    assert flux._thread_map(worker, samples, numcores=1) == \
+        pytest.approx([1, 5, 9, 13, 17, 21])
+    assert worker.nchunks == 0
+
+
+def test_calc_flux_invalid_backend():
+    """The backend argument is checked."""
+
+    from sherpa.astro.flux import calc_flux
+
+    with pytest.raises(ArgumentErr) as exc:
+        calc_flux(None, None, [], backend='gpu')
+
+    assert str(exc.value) == "Invalid backend: 'gpu'"
+
+
+@pytest.mark.parametrize("method", [ui.sample_energy_flux,
+                                    ui.sample_photon_flux])
+def test_sample_flux_out(method, clean_astro_ui):
+    """The out array is filled in and returned."""
+
+    ui.load_arrays(1, [1, 2, 3], [2, 5, 3], ui.Data1D)
+    ui.set_source(ui.polynom1d.mdl)
+    mdl.c1.thaw()
+
+    out = np.full((5, 4), -1.0)
+    np.random.seed(2371)
+    vals = method(1, 3, num=5, scales=[0.1, 0.2], out=out)
+    assert vals is out
+    assert np.all(out[:, 0] > -1)
+
+    np.random.seed(2371)
+    expected = method(1, 3, num=5, scales=[0.1, 0.2])
+    assert out == pytest.approx(expected)
+
+
+def test_sample_flux_out_float32(clean_astro_ui):
+    """The out array can use single precision."""
+
+    ui.load_arrays(1, [1, 2, 3], [2, 5, 3], ui.Data1D)
+    ui.set_source(ui.polynom1d.mdl)
+    mdl.c1.thaw()
+
+    out = np.zeros((5, 4), dtype=np.float32)
+    np.random.seed(2371)
+    vals = ui.sample_energy_flux(1, 3, num=5, scales=[0.1, 0.2], out=out)
+    assert vals is out
+    assert vals.dtype == np.float32
+
+    np.random.seed(2371)
+    expected = ui.sample_energy_flux(1, 3, num=5, scales=[0.1, 0.2])
+    assert expected.dtype == np.float64
+    assert vals == pytest.approx(expected, rel=1e-6)
+
+
+def test_sample_flux_clip_flag(clean_astro_ui):
+    """The clip column flags those rows with a clipped parameter."""
+
+    ui.load_arrays(1, [1, 2, 3], [2, 5, 3], ui.Data1D)
+    ui.set_source(ui.polynom1d.mdl)
+    mdl.c1.thaw()
+    mdl.c0 = 0
+    mdl.c0.min = -0.1
+    mdl.c1.max = 0.1
+
+    np.random.seed(9283)
+    vals = ui.sample_energy_flux(1, 3, num=200, scales=[0.1, 0.2],
+                                 clip='soft')
+
+    pars = vals[:, 1:-1]
+    assert pars[:, 0].min() == pytest.approx(-0.1)
+    assert pars[:, 1].max() == pytest.approx(0.1)
+
+    expected = (pars[:, 0] == -0.1) | (pars[:, 1] == 0.1)
+    assert expected.any()
+    assert not expected.all()
+    assert vals[:, -1] == pytest.approx(expected.astype(float))
+
+
+@pytest.mark.parametrize("method", [ui.sample_energy_flux,
+                                    ui.sample_photon_flux])
+def test_sample_flux_num_float(method, clean_astro_ui):
+    """num does not have to be an integer."""
+
+    ui.load_arrays(1, [1, 2, 3], [2, 5, 3], ui.Data1D)
+    ui.set_source(ui.polynom1d.mdl)
+    mdl.c1.thaw()
+
+    np.random.seed(2371)
+    vals = method(1, 3, num=5.0, scales=[0.1, 0.2])
+    assert vals.shape == (5, 4)
+
+    np.random.seed(2371)
+    expected = method(1, 3, num=5, scales=[0.1, 0.2])
+    assert vals == pytest.approx(expected)
+
+    out = np.zeros((5, 4))
+    assert method(1, 3, num=5.0, scales=[0.1, 0.2], out=out) is out
+
+
+def test_sample_flux_out_invalid(clean_astro_ui):
+    """The shape of out is checked."""
+
+    ui.load_arrays(1, [1, 2, 3], [2, 5, 3], ui.Data1D)
+    ui.set_source(ui.polynom1d.mdl)
+
+    with pytest.raises(ArgumentErr) as exc:
+        ui.sample_energy_flux(1, 3, num=5, scales=[0.1], out=np.zeros((5, 2)))
+
+    assert str(exc.value) == "Invalid out: 'must have shape (5, 3)'"
+
+
 @requires_data
 @requires_fits
 @pytest.mark.parametrize("id", [None, 1, "foo"])
@@ -2576,3 +2861,19 @@ def test_sample_flux_pha_bkg_full_model(idval, make_data_path, clean_astro_ui,
                        correlated=False, scales=scal)
 
     assert str(ie.value) == 'Please use calc_energy_flux as set_bkg_full_model was used'
+
+
+def test_sample_flux_session_rng(clean_astro_ui):
+    """The session rng is used to create the samples."""
+
+    ui.load_arrays(1, [1, 2, 3], [2, 5, 3], ui.Data1D)
+    ui.set_source(ui.polynom1d.mdl)
+    mdl.c1.thaw()
+
+    ui.set_rng(np.random.default_rng(4821))
+    vals1 = ui.sample_energy_flux(1, 3, num=5, scales=[0.1, 0.2])
+
+    ui.set_rng(np.random.default_rng(4821))
+    vals2 = ui.sample_energy_flux(1, 3, num=5, scales=[0.1, 0.2])
+
+    assert vals1 == pytest.approx(vals2)
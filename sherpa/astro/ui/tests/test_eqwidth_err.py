@@ -17,11 +17,14 @@
 #  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
+import multiprocessing
+
 import numpy as np
 
 import pytest
 
 from sherpa.astro import ui
+import sherpa.utils
 from sherpa.utils.err import IOErr, SessionErr
 from sherpa.utils.testing import requires_data, requires_fits, requires_xspec
 
@@ -224,3 +227,110 @@ def test_eqwidth_err_arg_square(clean_astro_ui):
         ui.eqwidth(cmdl, cmdl + pmdl, **arglist)
 
     assert str(exc.value) == 'covar_matrix must be of dimension (2, 2)'
+
+
+@pytest.fixture
+def line_fit(clean_astro_ui):
+    """Fit a constant plus gaussian line to data set 'bob'.
+
+    Only the constant and the line amplitude are free.
+    """
+
+    ui.load_arrays('bob', np.arange(1, 20), np.ones(19), ui.Data1D)
+
+    cmdl = ui.const1d.cmdl
+    gmdl = ui.gauss1d.gmdl
+    cmdl.c0 = 2
+    gmdl.pos = 10
+    gmdl.fwhm = 2
+    gmdl.ampl = 1
+    ui.freeze(gmdl.pos, gmdl.fwhm)
+    ui.set_source('bob', cmdl + gmdl)
+    ui.fit('bob')
+    return cmdl, gmdl
+
+
+def test_eqwidth_err_params_clipped(line_fit):
+    """The params values are clipped to the soft limits."""
+
+    cmdl, gmdl = line_fit
+    gmdl.ampl.max = 5
+
+    # The last column has ampl > 5 so it will be clipped
+    params = np.asarray([[1, 2, 4, 2], [1, 0.5, 2, 10]])
+    res = ui.eqwidth(cmdl, cmdl + gmdl, id='bob', error=True,
+                     params=params)
+
+    assert res[3] is params
+    expected = []
+    for c, a in [(1, 1), (2, 0.5), (4, 2), (2, 5)]:
+        cmdl.c0 = c
+        gmdl.ampl = a
+        expected.append(ui.eqwidth(cmdl, cmdl + gmdl, id='bob'))
+
+    # The eqwidth values are returned sorted
+    assert res[4] == pytest.approx(np.sort(expected))
+
+
+def test_eqwidth_err_rng(line_fit):
+    """The rng argument is used to create the draws."""
+
+    cmdl, gmdl = line_fit
+
+    cmat = np.asarray([[0.01, 0.001], [0.001, 0.02]])
+
+    def calc(seed):
+        return ui.eqwidth(cmdl, cmdl + gmdl, id='bob', error=True,
+                          niter=20, covar_matrix=cmat,
+                          rng=np.random.default_rng(seed))
+
+    res1 = calc(8273)
+    res2 = calc(8273)
+    res3 = calc(3)
+
+    assert res1[3].shape == (2, 21)
+    assert res1[3] == pytest.approx(res2[3])
+    assert res1[4] == pytest.approx(res2[4])
+    assert res1[3] != pytest.approx(res3[3])
+
+
+def test_eqwidth_err_numcores(line_fit):
+    """The results do not depend on the number of cores."""
+
+    cmdl, gmdl = line_fit
+
+    orig = [cmdl.c0.val, gmdl.ampl.val]
+    params = np.asarray([[1.0, 2.0, 4.0, 2.0, 3.0],
+                         [1.0, 0.5, 2.0, 3.0, 1.5]])
+    res1 = ui.eqwidth(cmdl, cmdl + gmdl, id='bob', error=True,
+                      params=params)
+    res2 = ui.eqwidth(cmdl, cmdl + gmdl, id='bob', error=True,
+                      params=params, numcores=2)
+
+    assert res2[4] == pytest.approx(res1[4])
+    assert res2[0] == pytest.approx(res1[0])
+
+    # The parameter values are restored
+    assert [cmdl.c0.val, gmdl.ampl.val] == pytest.approx(orig)
+
+
+def test_eqwidth_err_numcores_spawn(line_fit, monkeypatch):
+    """The calculation can be run with the spawn start method.
+
+    The processes are created from a spawn context, rather than
+    changing the start method for the whole test run.
+    """
+
+    cmdl, gmdl = line_fit
+
+    params = np.asarray([[1.0, 2.0, 4.0, 2.0],
+                         [1.0, 0.5, 2.0, 3.0]])
+    res1 = ui.eqwidth(cmdl, cmdl + gmdl, id='bob', error=True,
+                      params=params)
+
+    monkeypatch.setattr(sherpa.utils, 'multiprocessing',
+                        multiprocessing.get_context('spawn'))
+    res2 = ui.eqwidth(cmdl, cmdl + gmdl, id='bob', error=True,
+                      params=params, numcores=2)
+
+    assert res2[4] == pytest.approx(res1[4])
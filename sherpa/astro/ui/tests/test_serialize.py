@@ -50,7 +50,8 @@ import pytest
 from sherpa.utils.testing import get_datadir, requires_data, \
     requires_xspec, has_package_from_list, requires_fits, requires_group
 from sherpa.astro import ui
-# from sherpa.astro.ui import serialize
+from sherpa.astro.ui import serialize
+from sherpa.utils.err import IOErr
 
 logger = logging.getLogger('sherpa')
 
@@ -1416,6 +1417,54 @@ def test_canonical_empty_outfile():
     compare_lines(_canonical_empty, output)
 
 
+def test_save_all_error_does_not_create_file(tmp_path, monkeypatch):
+    "An error when creating the output does not create the file"
+
+    def fail(state, fh=None):
+        fh.write('# partial output\n')
+        raise ValueError('serialization failed')
+
+    monkeypatch.setattr(serialize, 'save_all', fail)
+
+    outfile = tmp_path / 'fail.sherpa'
+    with pytest.raises(ValueError):
+        ui.save_all(str(outfile))
+
+    assert not outfile.exists()
+
+
+def test_save_all_clobber(tmp_path):
+    "An existing file is only over-written when clobber is set"
+
+    outfile = tmp_path / 'save.sherpa'
+    outfile.write_text('not a save file')
+
+    with pytest.raises(IOErr) as exc:
+        ui.save_all(str(outfile))
+
+    assert str(exc.value) == f"file '{outfile}' exists and clobber is not set"
+    assert outfile.read_text() == 'not a save file'
+
+    ui.save_all(str(outfile), clobber=True)
+    compare_lines(_canonical_empty, outfile.read_text())
+
+
+def test_save_all_single_write():
+    "The output is sent to a file handle with a single write call"
+
+    class Store(StringIO):
+        nwrites = 0
+
+        def write(self, s):
+            self.nwrites += 1
+            return super().write(s)
+
+    store = Store()
+    ui.save_all(store)
+    assert store.nwrites == 1
+    compare_lines(_canonical_empty, store.getvalue())
+
+
 def test_canonical_empty_stats():
     "Change several settings but load no data"
 
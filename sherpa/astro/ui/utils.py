@@ -18,6 +18,7 @@
 #  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
+from io import StringIO
 import logging
 import os
 import sys
@@ -36,7 +37,6 @@ from sherpa.utils.err import ArgumentErr, ArgumentTypeErr, DataErr, \
 from sherpa.data import Data1D, Data1DAsymmetricErrs
 import sherpa.astro.all
 import sherpa.astro.plot
-from sherpa.astro.ui import serialize
 from sherpa.sim import NormalParameterSampleFromScaleMatrix
 from sherpa.stats import Cash, CStat, WStat
 from sherpa.models.basic import TableModel
@@ -1979,6 +1979,51 @@ class Session(sherpa.ui.utils.Session):
             raise ArgumentErr('noimg', self._fix_id(id))
         return data
 
+    def _get_data_and_model(self, id, bkg_id, source=True, model=None):
+        """Return the data set and model for the calc_xxx routines.
+
+        Parameters
+        ----------
+        id : int, str, or None
+            The dataset identifier.
+        bkg_id : int, str, or None
+            If set, the background component to use.
+        source : bool, optional
+            Return the source expression (True) or the model expression,
+            which includes any instrument response (False).
+        model : sherpa.models.Model instance or None, optional
+            If set, this model is returned instead of the one
+            associated with the dataset.
+
+        Returns
+        -------
+        data, model
+            The data set (or background) and model expression.
+
+        """
+        if model is not None:
+            _check_type(model, sherpa.models.Model, 'model',
+                        'a model object')
+            if bkg_id is None:
+                return self.get_data(id), model
+
+            return self.get_bkg(id, bkg_id), model
+
+        if bkg_id is None:
+            data = self.get_data(id)
+            if source:
+                model = self.get_source(id)
+            else:
+                model = self.get_model(id)
+        else:
+            data = self.get_bkg(id, bkg_id)
+            if source:
+                model = self.get_bkg_source(id, bkg_id)
+            else:
+                model = self.get_bkg_model(id, bkg_id)
+
+        return data, model
+
     # def _read_error(self, filename, *args, **kwargs):
     #     err = None
     #     try:
@@ -12930,7 +12975,7 @@ class Session(sherpa.ui.utils.Session):
     def sample_photon_flux(self, lo=None, hi=None, id=None, num=1,
                            scales=None, correlated=False,
                            numcores=None, bkg_id=None, model=None,
-                           otherids=(), clip='hard'):
+                           otherids=(), clip='hard', out=None):
         """Return the photon flux distribution of a model.
 
         For each iteration, draw the parameter values of the model
@@ -12939,6 +12984,11 @@ class Session(sherpa.ui.utils.Session):
         contains the flux and parameter values for each iteration.
         The units for the flux are as returned by `calc_photon_flux`.
 
+        .. versionchanged:: 4.14.1
+           The out parameter was added, and the parameter values are
+           drawn using the session random number generator (see
+           `set_rng`).
+
         .. versionchanged:: 4.12.2
            The model, otherids, and clip parameters were added and
            the return value has an extra column.
@@ -13001,6 +13051,12 @@ class Session(sherpa.ui.utils.Session):
             clipping. The last column in the returned arrays indicates
             if the row had any clipped parameters (even when clip is
             set to 'none').
+        out : 2D NumPy array or None, optional
+            If set, the array is filled with the results and returned,
+            rather than a new array being created. It must have the
+            shape ``(num, N+2)``. The values are calculated at double
+            precision, but the array can be created with a smaller
+            type, such as ``numpy.float32``, to save memory.
 
         Returns
         -------
@@ -13157,12 +13213,13 @@ class Session(sherpa.ui.utils.Session):
                                              correlated=correlated,
                                              num=num, lo=lo, hi=hi,
                                              numcores=numcores,
-                                             samples=scales, clip=clip)
+                                             samples=scales, clip=clip,
+                                             rng=self.get_rng(), out=out)
 
     def sample_energy_flux(self, lo=None, hi=None, id=None, num=1,
                            scales=None, correlated=False,
                            numcores=None, bkg_id=None, model=None,
-                           otherids=(), clip='hard'):
+                           otherids=(), clip='hard', out=None):
         """Return the energy flux distribution of a model.
 
         For each iteration, draw the parameter values of the model
@@ -13171,6 +13228,11 @@ class Session(sherpa.ui.utils.Session):
         contains the flux and parameter values for each iteration.
         The units for the flux are as returned by `calc_energy_flux`.
 
+        .. versionchanged:: 4.14.1
+           The out parameter was added, and the parameter values are
+           drawn using the session random number generator (see
+           `set_rng`).
+
         .. versionchanged:: 4.12.2
            The model, otherids, and clip parameters were added and
            the return value has an extra column.
@@ -13233,6 +13295,12 @@ class Session(sherpa.ui.utils.Session):
             clipping. The last column in the returned arrays indicates
             if the row had any clipped parameters (even when clip is
             set to 'none').
+        out : 2D NumPy array or None, optional
+            If set, the array is filled with the results and returned,
+            rather than a new array being created. It must have the
+            shape ``(num, N+2)``. The values are calculated at double
+            precision, but the array can be created with a smaller
+            type, such as ``numpy.float32``, to save memory.
 
         Returns
         -------
@@ -13389,7 +13457,8 @@ class Session(sherpa.ui.utils.Session):
                                              correlated=correlated,
                                              num=num, lo=lo, hi=hi,
                                              numcores=numcores,
-                                             samples=scales, clip=clip)
+                                             samples=scales, clip=clip,
+                                             rng=self.get_rng(), out=out)
 
     def sample_flux(self, modelcomponent=None, lo=None, hi=None, id=None,
                     num=1, scales=None, correlated=False,
@@ -13572,14 +13641,14 @@ class Session(sherpa.ui.utils.Session):
         #
         if bkg_id is not None:
             try:
-                self.get_bkg_source(id, bkg_id)
+                src = self.get_bkg_source(id, bkg_id)
             except (IdentifierErr, ModelErr):
                 # At present ModelErr is thrown but keep in IdentifierErr
                 # just in case
                 raise IdentifierErr('Please use calc_energy_flux as set_bkg_full_model was used') from None
         else:
             try:
-                self.get_source(id)
+                src = self.get_source(id)
             except IdentifierErr:
                 raise IdentifierErr('Please use calc_energy_flux as set_full_model was used') from None
 
@@ -13590,22 +13659,20 @@ class Session(sherpa.ui.utils.Session):
         #
         niter = num + 1
 
-        if not Xrays:
-            # NOTE: calc_energy_flux only returns a scalar, which means you can
-            #       not pass the results to calc_sample_flux, so this code
-            #       is currently broken
-            #
-            samples = self.calc_energy_flux(lo=lo, hi=hi, id=id,
-                                            bkg_id=bkg_id)
-        else:
-            # NOTE: the samples are drawn from the full model expression
-            #       as this is how it was originally written
-            #
-            samples = self.sample_energy_flux(lo=lo, hi=hi, id=id, num=niter,
-                                              scales=scales, clip='soft',
-                                              correlated=correlated,
-                                              numcores=numcores,
-                                              bkg_id=bkg_id)
+        # NOTE: the samples are drawn from the full model expression
+        #       as this is how it was originally written. This is
+        #       what sample_energy_flux does, but the fit, data, and
+        #       source have already been found so they are re-used.
+        #       Xrays=False was rejected above, so there is no need
+        #       to support a calc_energy_flux path here.
+        #
+        samples = sherpa.astro.flux.sample_flux(fit, data, src,
+                                                method=sherpa.astro.utils.calc_energy_flux,
+                                                correlated=correlated,
+                                                num=niter, lo=lo, hi=hi,
+                                                numcores=numcores,
+                                                samples=scales, clip='soft',
+                                                rng=self.get_rng())
 
         return sherpa.astro.flux.calc_sample_flux(lo=lo, hi=hi,
                                                   fit=fit, data=data, samples=samples,
@@ -13614,12 +13681,15 @@ class Session(sherpa.ui.utils.Session):
 
     def eqwidth(self, src, combo, id=None, lo=None, hi=None, bkg_id=None,
                 error=False, params=None, otherids=(), niter=1000,
-                covar_matrix=None):
+                covar_matrix=None, rng=None, numcores=1):
         """Calculate the equivalent width of an emission or absorption line.
 
         The equivalent width [1]_ is calculated in the selected units
         for the data set (which can be retrieved with `get_analysis`).
 
+        .. versionchanged:: 4.14.1
+           The `rng` and `numcores` parameters were added.
+
         .. versionchanged:: 4.10.1
            The `error` parameter was added which controls whether the
            return value is a scalar (the calculated equivalent width),
@@ -13661,6 +13731,16 @@ class Session(sherpa.ui.utils.Session):
         covar_matrix : 2D array, optional
            The covariance matrix to use. If ``None`` then the
            result from `get_covar_results().extra_output` is used.
+        rng : numpy.random.Generator or None, optional
+           The random number generator used to create the parameter
+           draws when ``error`` is ``True`` and the statistic is not
+           one of the likelihood statistics. If ``None`` then the
+           session generator is used (see `set_rng`).
+        numcores : int or None, optional
+           The number of CPU cores to use when calculating the
+           equivalent widths for the parameter draws (it is only used
+           when ``error`` is ``True``). The default is ``1``, and
+           ``None`` means use all the available cores.
 
         Returns
         -------
@@ -13729,8 +13809,9 @@ class Session(sherpa.ui.utils.Session):
         >>> plot_cdf(ews)
 
         """
-        data = self.get_data(id)
-        if bkg_id is not None:
+        if bkg_id is None:
+            data = self.get_data(id)
+        else:
             data = self.get_bkg(id, bkg_id)
 
         ####################################################
@@ -13778,27 +13859,39 @@ class Session(sherpa.ui.utils.Session):
                                        covar_matrix=covar_matrix)
                 else:
                     sampler = NormalParameterSampleFromScaleMatrix()
-                    tmp = sampler.get_sample(fit, covar_matrix, niter + 1)
+                    if rng is None:
+                        rng = self.get_rng()
+
+                    tmp = sampler.get_sample(fit, covar_matrix, niter + 1,
+                                             rng=rng)
                     params = tmp.transpose()
 
             else:
                 is_numpy_ndarray(params, 'params', npar)
 
-            mins = fit.model._get_thawed_par_mins()
-            maxs = fit.model._get_thawed_par_maxes()
-            eqw = numpy.zeros_like(params[0, :])
-            for params_index in range(len(params[0, :])):
-                for parnames_index, parname in enumerate(parnames):
-                    val = params[parnames_index, params_index]
-                    # Note: the normal dist does not respect the soft limits
-                    mymin = mins[parnames_index]
-                    mymax = maxs[parnames_index]
-                    val = max(mymin, min(val, mymax))
-                    self.set_par(parname, val)
-                eqw[params_index] = \
-                    sherpa.astro.utils.eqwidth(data, src, combo, lo, hi)
+            # Note: the normal dist does not respect the soft limits,
+            # so clip all the draws at once before evaluating them.
+            #
+            # The draws are stored with one row per set of parameters,
+            # in C order, so that each set is a contiguous block of
+            # memory whatever the layout of params.
+            #
+            mins = numpy.asarray(fit.model._get_thawed_par_mins())
+            maxs = numpy.asarray(fit.model._get_thawed_par_maxes())
+            draws = numpy.clip(params.T, mins, maxs, order='C')
+
+            # The worker is pickled when run in parallel, so each
+            # process works on its own copy of the models.
+            #
+            worker = sherpa.astro.utils.EqwidthWorker(data, src, combo,
+                                                      fit.model, lo, hi)
+            try:
+                eqw = sherpa.utils.parallel_map(worker, draws, numcores)
+            finally:
+                fit.model.thawedpars = orig_par_vals
+
+            eqw = numpy.asarray(eqw, dtype=params.dtype)
             median, lower, upper = sherpa.utils.get_error_estimates(eqw)
-            fit.model.thawedpars = orig_par_vals
             return median, lower, upper, params, eqw
 
         ####################################################
@@ -13812,16 +13905,21 @@ class Session(sherpa.ui.utils.Session):
         the spectral model evaluated for each bin (that is, the model
         without any instrumental responses applied to it).
 
+        .. versionchanged:: 4.14.1
+           The `lo` and `hi` arguments can be arrays.
+
         .. versionchanged:: 4.12.1
            The model parameter was added.
 
         Parameters
         ----------
-        lo, hi : number, optional
+        lo, hi : number or array, optional
            If both are None or both are set then calculate the flux
            over the given band. If only one is set then calculate
            the flux density at that point. The units for `lo` and `hi`
-           are given by the current analysis setting.
+           are given by the current analysis setting. If arrays are
+           given, they must have the same shape, and the flux is
+           calculated for each band (the model is only evaluated once).
         id : int or str, optional
            Use the source expression associated with this data set. If
            not given then the default identifier is used, as returned
@@ -13836,7 +13934,7 @@ class Session(sherpa.ui.utils.Session):
 
         Returns
         -------
-        flux : number
+        flux : number or array
            The flux or flux density.  For X-Spec style models the
            flux units will be photon/cm^2/s and the flux density units
            will be either photon/cm^2/s/keV or photon/cm^2/s/Angstrom,
@@ -13911,20 +14009,7 @@ class Session(sherpa.ui.utils.Session):
 
         """
 
-        if bkg_id is None:
-            data = self.get_data(id)
-        else:
-            data = self.get_bkg(id, bkg_id)
-
-        if model is None:
-            if bkg_id is None:
-                model = self.get_source(id)
-            else:
-                model = self.get_bkg_source(id, bkg_id)
-        else:
-            _check_type(model, sherpa.models.Model, 'model',
-                        'a model object')
-
+        data, model = self._get_data_and_model(id, bkg_id, model=model)
         return sherpa.astro.utils.calc_photon_flux(data, model, lo, hi)
 
     def calc_energy_flux(self, lo=None, hi=None, id=None, bkg_id=None,
@@ -13936,16 +14021,21 @@ class Session(sherpa.ui.utils.Session):
         for that bin (that is, the model without any instrumental
         responses applied to it).
 
+        .. versionchanged:: 4.14.1
+           The `lo` and `hi` arguments can be arrays.
+
         .. versionchanged:: 4.12.1
            The model parameter was added.
 
         Parameters
         ----------
-        lo, hi : number, optional
+        lo, hi : number or array, optional
            If both are None or both are set then calculate the flux
            over the given band. If only one is set then calculate
            the flux density at that point. The units for `lo` and `hi`
-           are given by the current analysis setting.
+           are given by the current analysis setting. If arrays are
+           given, they must have the same shape, and the flux is
+           calculated for each band (the model is only evaluated once).
         id : int or str, optional
            Use the source expression associated with this data set. If
            not given then the default identifier is used, as returned
@@ -13960,7 +14050,7 @@ class Session(sherpa.ui.utils.Session):
 
         Returns
         -------
-        flux : number
+        flux : number or array
            The flux or flux density.  For X-Spec style models the
            flux units will be erg/cm^2/s and the flux density units
            will be either erg/cm^2/s/keV or erg/cm^2/s/Angstrom,
@@ -14031,20 +14121,7 @@ class Session(sherpa.ui.utils.Session):
 
         """
 
-        if bkg_id is None:
-            data = self.get_data(id)
-        else:
-            data = self.get_bkg(id, bkg_id)
-
-        if model is None:
-            if bkg_id is None:
-                model = self.get_source(id)
-            else:
-                model = self.get_bkg_source(id, bkg_id)
-        else:
-            _check_type(model, sherpa.models.Model, 'model',
-                        'a model object')
-
+        data, model = self._get_data_and_model(id, bkg_id, model=model)
         return sherpa.astro.utils.calc_energy_flux(data, model, lo, hi)
 
     # DOC-TODO: how do lo/hi limits interact with bin edges;
@@ -14134,8 +14211,9 @@ class Session(sherpa.ui.utils.Session):
         >>> calc_data_sum(12, 45, id=3, bkg_id=2)
 
         """
-        data = self.get_data(id)
-        if bkg_id is not None:
+        if bkg_id is None:
+            data = self.get_data(id)
+        else:
             data = self.get_bkg(id, bkg_id)
         return sherpa.astro.utils.calc_data_sum(data, lo, hi)
 
@@ -14243,13 +14321,7 @@ class Session(sherpa.ui.utils.Session):
         6.179472329646446
 
         """
-        data = self.get_data(id)
-        model = None
-        if bkg_id is not None:
-            data = self.get_bkg(id, bkg_id)
-            model = self.get_bkg_model(id, bkg_id)
-        else:
-            model = self.get_model(id)
+        data, model = self._get_data_and_model(id, bkg_id, source=False)
         return sherpa.astro.utils.calc_model_sum(data, model, lo, hi)
 
     def calc_data_sum2d(self, reg=None, id=None):
@@ -14587,13 +14659,7 @@ class Session(sherpa.ui.utils.Session):
         6.179472329646446
 
         """
-        data = self.get_data(id)
-        model = None
-        if bkg_id is not None:
-            data = self.get_bkg(id, bkg_id)
-            model = self.get_bkg_source(id, bkg_id)
-        else:
-            model = self.get_source(id)
+        data, model = self._get_data_and_model(id, bkg_id)
         return sherpa.astro.utils.calc_source_sum(data, model, lo, hi)
 
     # DOC-TODO: no reason can't k-correct wavelength range,
@@ -14714,14 +14780,7 @@ class Session(sherpa.ui.utils.Session):
         >>> calc_kcorr(0.5, 0.5, 2, 2, 10, bkg_id=2)
 
         """
-        data = self.get_data(id)
-        model = None
-        if bkg_id is not None:
-            data = self.get_bkg(id, bkg_id)
-            model = self.get_bkg_source(id, bkg_id)
-        else:
-            model = self.get_source(id)
-
+        data, model = self._get_data_and_model(id, bkg_id)
         return sherpa.astro.utils.calc_kcorr(data, model, z, obslo, obshi,
                                              restlo, resthi)
 
@@ -14804,20 +14863,29 @@ class Session(sherpa.ui.utils.Session):
 
         """
 
-        if isinstance(outfile, string_types):
-            if os.path.isfile(outfile):
-                if sherpa.utils.bool_cast(clobber):
-                    os.remove(outfile)
-                else:
-                    raise IOErr('filefound', outfile)
+        # The serialization code is only needed here, so it is only
+        # loaded when save_all is called.
+        #
+        from sherpa.astro.ui import serialize
 
-            with open(outfile, 'w') as fh:
-                serialize.save_all(self, fh)
+        if outfile is None:
+            serialize.save_all(self, sys.stdout)
+            return
 
-        else:
-            if outfile is not None:
-                fh = outfile
-            else:
-                fh = sys.stdout
+        # Create the output before writing it, so that it is written
+        # in one go (the file handle may not be buffered) and a file
+        # is not left partially written if there is an error.
+        #
+        store = StringIO()
+        serialize.save_all(self, store)
 
-            serialize.save_all(self, fh)
+        if not isinstance(outfile, string_types):
+            outfile.write(store.getvalue())
+            return
+
+        mode = 'w' if sherpa.utils.bool_cast(clobber) else 'x'
+        try:
+            with open(outfile, mode) as fh:
+                fh.write(store.getvalue())
+        except FileExistsError:
+            raise IOErr('filefound', outfile) from None
@@ -287,7 +287,34 @@ def range_overlap_1dint(axislist, lo, hi):
     return scale if ascending else scale[::-1]
 
 
-def _flux(data, lo, hi, src, eflux=False, srcflux=False):
+def _flux_grid(data, lo, hi, eflux=False, srcflux=False):
+    """Return the information needed to calculate a flux.
+
+    The grid depends only on the data and the band, and not on the
+    model, so it can be re-used when the flux is calculated for
+    many sets of parameter values.
+
+    Parameters
+    ----------
+    data
+       The data object to use.
+    lo, hi : number or None
+       The band (see calc_energy_flux).
+    eflux : bool, optional
+       Is this an energy flux?
+    srcflux : bool, optional
+       Should integrated models be divided by the bin width?
+
+    Returns
+    -------
+    grid : tuple or None
+       None if the band does not overlap the data, otherwise the
+       independent axes, the per-bin terms that convert the model
+       values to a flux, and the eflux flag. It is meant to be
+       passed to _flux_eval.
+
+    """
+
     lo, hi = bounds_check(lo, hi)
 
     try:
@@ -304,12 +331,11 @@ def _flux(data, lo, hi, src, eflux=False, srcflux=False):
     # about a nice error message
     assert dim > 0
 
-    # To make things simpler, evaluate on the full grid
-    y = src(*axislist)
-
+    width = None
     if srcflux and dim == 2:
-        y /= numpy.asarray(axislist[1] - axislist[0])
+        width = numpy.asarray(axislist[1] - axislist[0])
 
+    ecorr = None
     if eflux:
         # for energy flux, the sum of grid below must be in keV.
         #
@@ -328,8 +354,6 @@ def _flux(data, lo, hi, src, eflux=False, srcflux=False):
             # why multiply by 0.5?
             ecorr = 0.5 * energ[0]
 
-        y *= ecorr
-
     # What bins do we use for the calculation? Linear interpolation
     # is used for bin edges (for integrated data sets)
     #
@@ -339,7 +363,7 @@ def _flux(data, lo, hi, src, eflux=False, srcflux=False):
 
         # no bin found
         if numpy.all(~mask):
-            return 0.0
+            return None
 
         # convert boolean to numbers
         scale = 1.0 * mask
@@ -347,7 +371,7 @@ def _flux(data, lo, hi, src, eflux=False, srcflux=False):
     else:
         scale = range_overlap_1dint(axislist, lo, hi)
         if scale is None:
-            return 0.0
+            return None
 
         assert scale.max() > 0
 
@@ -356,11 +380,144 @@ def _flux(data, lo, hi, src, eflux=False, srcflux=False):
     # we only calculate a density if the lo and hi values are the
     # same (which is set by bounds_check when a density is requested).
     #
+    density = None
     if lo is not None and dim == 2 and lo == hi:
         assert scale.sum() == 1, 'programmer error: sum={}'.format(scale.sum())
-        y /= numpy.abs(axislist[1] - axislist[0])
+        density = numpy.abs(axislist[1] - axislist[0])
+
+    return axislist, width, ecorr, density, scale, eflux
+
+
+def _flux_eval(src, grid):
+    """Calculate the flux of a model given the output of _flux_grid."""
+
+    # Return the same type as when the band overlaps the grid.
+    if grid is None:
+        return numpy.float64(0)
+
+    axislist, width, ecorr, density, scale, eflux = grid
+
+    # To make things simpler, evaluate on the full grid
+    y = src(*axislist)
+
+    if width is not None:
+        y /= width
+
+    if ecorr is not None:
+        y *= ecorr
+
+    if density is not None:
+        y /= density
+
+    # A dot product avoids creating the scale * y temporary.
+    flux = numpy.dot(scale, y)
+    if eflux:
+        flux *= charge_e
+
+    return flux
+
+
+def _flux(data, lo, hi, src, eflux=False, srcflux=False):
+    grid = _flux_grid(data, lo, hi, eflux=eflux, srcflux=srcflux)
+    return _flux_eval(src, grid)
+
+
+def _flux_bands(data, lo, hi, src, eflux=False):
+    """Calculate the flux of a model for a set of bands.
+
+    This is the same as calling _flux for each lo, hi pair, but
+    the model is only evaluated once, and the bin sums are
+    calculated for all the bands at once.
+
+    Parameters
+    ----------
+    data
+       The data object to use.
+    lo, hi : sequence of numbers
+       The band limits, with lo < hi for each band.
+    src
+       The model.
+    eflux : bool, optional
+       Is this an energy flux?
+
+    Returns
+    -------
+    flux : numpy array
+       The flux for each band.
+
+    """
+
+    lo = numpy.asarray(lo, dtype=float)
+    hi = numpy.asarray(hi, dtype=float)
+    if lo.size == 0:
+        return numpy.zeros(0)
+
+    # Only the axes and energy correction are used from the grid,
+    # as the bin scaling is calculated below for each band.
+    #
+    grid = _flux_grid(data, lo.min(), hi.max(), eflux=eflux)
+    if grid is None:
+        return numpy.zeros(lo.size)
+
+    axislist = grid[0]
+    if len(axislist) != 2:
+        return numpy.asarray([_flux(data, blo, bhi, src, eflux=eflux)
+                              for blo, bhi in zip(lo, hi)], dtype=float)
+
+    y = src(*axislist)
+    ecorr = grid[2]
+    if ecorr is not None:
+        y *= ecorr
+
+    # Create the bin edges the same way as range_overlap_1dint,
+    # so the partial-bin scaling matches that used by _flux.
+    #
+    axislo = numpy.asarray(axislist[0])
+    axishi = numpy.asarray(axislist[1])
+    if axislo.size == 1 or axislo[1] > axislo[0]:
+        edges = numpy.append(axislo, axishi[-1])
+    else:
+        edges = numpy.append(axishi[0], axislo)[::-1]
+        y = y[::-1]
+
+    # The flux in a band is the sum of the bins that are fully
+    # included, calculated for all bands at once with reduceat, plus
+    # the partial contributions of the bins containing the band
+    # edges (using the same scaling as range_overlap_1dint). Each
+    # band is summed directly, rather than taking the difference of
+    # a cumulative sum, to avoid losing precision for narrow bands.
+    #
+    nbins = y.size
+    width = edges[1:] - edges[:-1]
+    blo = numpy.clip(lo, edges[0], edges[-1])
+    bhi = numpy.clip(hi, edges[0], edges[-1])
+
+    ilo = numpy.searchsorted(edges, blo, side='right') - 1
+    ihi = numpy.searchsorted(edges, bhi, side='right') - 1
+    numpy.clip(ilo, 0, nbins - 1, out=ilo)
+    numpy.clip(ihi, 0, nbins - 1, out=ihi)
+
+    # The zero added to the end of y means the indices can run up
+    # to nbins. The sum is only valid for the bands with at least
+    # one fully-included bin.
+    #
+    start = ilo + 1
+    end = numpy.maximum(ihi, start)
+    idx = numpy.column_stack((start, end)).ravel()
+    full = numpy.add.reduceat(numpy.append(y, 0), idx)[::2]
+    full[end == start] = 0
+
+    single = ilo == ihi
+    flux = numpy.where(single,
+                       y[ilo] * (bhi - blo) / width[ilo],
+                       y[ilo] * (edges[ilo + 1] - blo) / width[ilo] +
+                       full +
+                       y[ihi] * (bhi - edges[ihi]) / width[ihi])
+
+    # Bands which do not overlap the grid have no flux.
+    #
+    flux[bhi <= blo] = 0
 
-    flux = (scale * y).sum()
     if eflux:
         flux *= charge_e
 
@@ -385,6 +542,12 @@ def _counts(data, lo, hi, func, *args):
 
 
 def _counts2d(data, reg, func, *args):
+    # There is no need to change the filter if the whole data set is
+    # being used and there is no existing filter.
+    #
+    if reg is None and data.mask is True:
+        return func(*args).sum()
+
     old_mask = data.mask
     coord = getattr(data, 'coord', None)
     old_region = getattr(data, '_region', None)
@@ -406,6 +569,33 @@ def _counts2d(data, reg, func, *args):
     return counts
 
 
+def _flux_lohi(data, lo, hi, src, eflux=False):
+    """Calculate the flux for a single band or an array of bands."""
+
+    if numpy.ndim(lo) == 0 and numpy.ndim(hi) == 0:
+        return _flux(data, lo, hi, src, eflux=eflux)
+
+    lo = numpy.asarray(lo, dtype=float)
+    hi = numpy.asarray(hi, dtype=float)
+    if lo.shape != hi.shape:
+        raise DataErr('mismatch', 'lo', 'hi')
+
+    bad = lo > hi
+    if bad.any():
+        idx = numpy.argmax(bad)
+        raise IOErr('boundscheck', lo.flat[idx], hi.flat[idx])
+
+    # Flux densities (lo == hi) are not handled by _flux_bands.
+    #
+    if (lo == hi).any():
+        flux = [_flux(data, blo, bhi, src, eflux=eflux)
+                for blo, bhi in zip(lo.flat, hi.flat)]
+        return numpy.asarray(flux, dtype=float).reshape(lo.shape)
+
+    flux = _flux_bands(data, lo.ravel(), hi.ravel(), src, eflux=eflux)
+    return flux.reshape(lo.shape)
+
+
 def calc_energy_flux(data, src, lo=None, hi=None):
     """Integrate the source model over a pass band.
 
@@ -413,6 +603,9 @@ def calc_energy_flux(data, src, lo=None, hi=None):
     the energy of the bin and S(E) the spectral model evaluated for
     that bin.
 
+    .. versionchanged:: 4.14.1
+       The `lo` and `hi` arguments can be arrays.
+
     Parameters
     ----------
     data
@@ -420,17 +613,20 @@ def calc_energy_flux(data, src, lo=None, hi=None):
     src
        The source expression: this should not include any instrument
        responses.
-    lo, hi : number, optional
+    lo, hi : number or array, optional
        If both are None or both are set then calculate the flux
        over the given band. If only one is set then calculate
        the flux density at that point. The units for `lo` and `hi`
        are given by the current analysis setting of the `data`
-       parameter.
+       parameter. If arrays are given, they must have the same
+       shape, and the model is only evaluated once to calculate the
+       flux for each band.
 
     Returns
     -------
     flux
-       The flux or flux density of the source model. For X-Spec
+       The flux or flux density of the source model. This is an
+       array when `lo` and `hi` are arrays. For X-Spec
        models the flux units will be erg/cm^2/s and the flux
        density is either erg/cm^2/s/keV or erg/cm^2/s/Angstrom,
        depending on the analysis setting.
@@ -476,7 +672,7 @@ def calc_energy_flux(data, src, lo=None, hi=None):
     5.2573786652855304e-10
 
     """
-    return _flux(data, lo, hi, src, eflux=True)
+    return _flux_lohi(data, lo, hi, src, eflux=True)
 
 
 def calc_photon_flux(data, src, lo=None, hi=None):
@@ -485,6 +681,9 @@ def calc_photon_flux(data, src, lo=None, hi=None):
     Calculate the integral of S(E) over a pass band, where S(E) is the
     spectral model evaluated for each bin.
 
+    .. versionchanged:: 4.14.1
+       The `lo` and `hi` arguments can be arrays.
+
     Parameters
     ----------
     data
@@ -492,17 +691,20 @@ def calc_photon_flux(data, src, lo=None, hi=None):
     src
        The source expression: this should not include any instrument
        responses.
-    lo, hi : number, optional
+    lo, hi : number or array, optional
        If both are None or both are set then calculate the flux
        over the given band. If only one is set then calculate
        the flux density at that point. The units for `lo` and `hi`
        are given by the current analysis setting of the `data`
-       parameter.
+       parameter. If arrays are given, they must have the same
+       shape, and the model is only evaluated once to calculate the
+       flux for each band.
 
     Returns
     -------
     flux
-       The flux or flux density of the source model. For X-Spec
+       The flux or flux density of the source model. This is an
+       array when `lo` and `hi` are arrays. For X-Spec
        models the flux units will be photon/cm^2/s and the flux
        density is either photon/cm^2/s/keV or
        photon/cm^2/s/Angstrom, depending on the analysis setting.
@@ -552,7 +754,7 @@ def calc_photon_flux(data, src, lo=None, hi=None):
     0.64978176
 
     """
-    return _flux(data, lo, hi, src)
+    return _flux_lohi(data, lo, hi, src)
 
 
 # ## DOC-TODO: compare to calc_photon_flux ?
@@ -841,6 +1043,29 @@ def eqwidth(data, model, combo, lo=None, hi=None):
     return eqw
 
 
+class EqwidthWorker():
+    """Internal class for use by the eqwidth error calculation.
+
+    The worker is sent to the processes created by parallel_map,
+    so it has to be pickleable when the spawn start method is used.
+    Each call sets the thawed parameters of the fit model to the
+    given values before calculating the equivalent width.
+    """
+
+    def __init__(self, data, model, combo, fitmodel, lo=None, hi=None):
+        self.data = data
+        self.model = model
+        self.combo = combo
+        self.fitmodel = fitmodel
+        self.lo = lo
+        self.hi = hi
+
+    def __call__(self, pars):
+        self.fitmodel.thawedpars = pars
+        return eqwidth(self.data, self.model, self.combo,
+                       self.lo, self.hi)
+
+
 def calc_kcorr(data, model, z, obslo, obshi, restlo=None, resthi=None):
     """Calculate the K correction for a model.
 
@@ -965,11 +1190,15 @@ def calc_kcorr(data, model, z, obslo, obshi, restlo=None, resthi=None):
         raise IOErr('energoverlap', emin, emax, 'rest-frame',
                     restlo, resthi, "at a redshift of %f" % z.min())
 
+    # The rest-frame band is calculated along with the observed-frame
+    # bands so that the model is only evaluated once.
+    #
     zplus1 = z + 1.0
-    flux_rest = _flux(data, restlo, resthi, model, eflux=True)
-    obs = numpy.asarray([_flux(data, obslo * zz, obshi * zz, model, eflux=True)
-                         for zz in zplus1], dtype=float)
-    kcorr = flux_rest / obs
+    flux = _flux_bands(data,
+                       numpy.append(restlo, obslo * zplus1),
+                       numpy.append(resthi, obshi * zplus1),
+                       model, eflux=True)
+    kcorr = flux[0] / flux[1:]
 
     if len(kcorr) == 1:
         return kcorr[0]
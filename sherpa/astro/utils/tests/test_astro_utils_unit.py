@@ -22,7 +22,12 @@ import numpy as np
 import pytest
 
 from sherpa.astro import ui
-from sherpa.astro.utils import do_group, filter_resp, range_overlap_1dint
+from sherpa.astro.data import DataIMG
+from sherpa.astro.utils import calc_energy_flux, calc_photon_flux, \
+    calc_kcorr, calc_data_sum2d, calc_model_sum2d, do_group, \
+    filter_resp, range_overlap_1dint
+from sherpa.models.basic import Const2D, PowLaw1D
+from sherpa.utils.err import DataErr, IOErr
 from sherpa.utils.testing import requires_data, requires_fits
 
 
@@ -220,3 +225,176 @@ def test_do_group_single_group(func, expected):
 
     ans = do_group([6, 4, 2, 1, -1, 3], [1, -1, -1, -1, -1, -1], func)
     assert ans == pytest.approx([expected])
+
+
+@pytest.mark.parametrize("func", [calc_energy_flux, calc_photon_flux])
+def test_flux_reuses_model_evaluation(func):
+    """Changing the band does not re-evaluate the model.
+
+    The model is evaluated on the full grid, whatever the band,
+    so the model cache can be used when only the band changes.
+    """
+
+    egrid = np.arange(1, 12)
+    elo, ehi = egrid[:-1], egrid[1:]
+    data = ui.DataPHA('x', np.arange(1, 11), np.zeros(10))
+    data.set_arf(ui.create_arf(elo, ehi, np.ones(10)))
+    data.set_rmf(ui.create_rmf(elo, ehi, e_min=elo, e_max=elo,
+                               startchan=1, fname=None))
+
+    mdl = PowLaw1D()
+    f1 = func(data, mdl, 2, 4)
+    f2 = func(data, mdl, 3, 7)
+    assert mdl._cache_ctr['misses'] == 1
+    assert mdl._cache_ctr['hits'] == 1
+
+    # The fluxes are still correct
+    assert f1 > 0
+    assert f2 > f1
+
+    mdl.gamma = 2
+    func(data, mdl, 3, 7)
+    assert mdl._cache_ctr['misses'] == 2
+
+
+def test_calc_kcorr_array_matches_scalar():
+    """The vector calculation of kcorr matches the scalar version."""
+
+    egrid = np.linspace(0.1, 11, 300)
+    elo, ehi = egrid[:-1], egrid[1:]
+    nbins = elo.size
+    data = ui.DataPHA('x', np.arange(1, nbins + 1), np.zeros(nbins))
+    data.set_arf(ui.create_arf(elo, ehi, np.ones(nbins)))
+    data.set_rmf(ui.create_rmf(elo, ehi, e_min=elo, e_max=elo,
+                               startchan=1, fname=None))
+
+    mdl = PowLaw1D()
+    mdl.gamma = 1.7
+
+    zs = np.linspace(0, 3, 21)
+    kz = calc_kcorr(data, mdl, zs, 0.5, 2, 0.3, 4)
+    assert kz.shape == zs.shape
+
+    expected = [calc_kcorr(data, mdl, z, 0.5, 2, 0.3, 4) for z in zs]
+    assert kz == pytest.approx(expected, rel=1e-12)
+
+    # Compare to the definition
+    frest = calc_energy_flux(data, mdl, 0.3, 4)
+    fobs = calc_energy_flux(data, mdl, 0.5 * 2.5, 2 * 2.5)
+    assert calc_kcorr(data, mdl, 1.5, 0.5, 2, 0.3, 4) == pytest.approx(frest / fobs)
+
+
+@pytest.mark.parametrize("func", [calc_energy_flux, calc_photon_flux])
+def test_flux_array_bands(func):
+    """The flux can be calculated for an array of bands."""
+
+    egrid = np.linspace(0.1, 11, 300)
+    elo, ehi = egrid[:-1], egrid[1:]
+    nbins = elo.size
+    data = ui.DataPHA('x', np.arange(1, nbins + 1), np.zeros(nbins))
+    data.set_arf(ui.create_arf(elo, ehi, np.ones(nbins)))
+    data.set_rmf(ui.create_rmf(elo, ehi, e_min=elo, e_max=elo,
+                               startchan=1, fname=None))
+
+    mdl = PowLaw1D()
+    mdl.gamma = 1.7
+
+    lo = np.asarray([0.5, 2, 0.5, 3.05, 20])
+    hi = np.asarray([2, 10, 7, 3.1, 30])
+    flux = func(data, mdl, lo, hi)
+    assert flux.shape == (5, )
+
+    expected = [func(data, mdl, l, h) for l, h in zip(lo, hi)]
+    assert flux == pytest.approx(expected, rel=1e-12)
+    assert flux[-1] == 0
+
+    # Flux densities are also supported
+    flux = func(data, mdl, [[0.5, 2]], [[2, 2]])
+    assert flux.shape == (1, 2)
+    assert flux[0] == pytest.approx([func(data, mdl, 0.5, 2),
+                                     func(data, mdl, 2)])
+
+
+@pytest.mark.parametrize("func", [calc_energy_flux, calc_photon_flux])
+def test_flux_array_bands_steep(func):
+    """Narrow bands in the tail of a steep spectrum keep their precision."""
+
+    egrid = np.logspace(-2, 2, 2001)
+    data = ui.Data1DInt('x', egrid[:-1], egrid[1:], np.ones(2000))
+
+    mdl = PowLaw1D()
+    mdl.gamma = 3.5
+
+    lo = np.asarray([0.01, 95, 99.95, 94.99, 0.5])
+    hi = np.asarray([100, 95.05, 100, 95.0, 2])
+    flux = func(data, mdl, lo, hi)
+
+    expected = [func(data, mdl, l, h) for l, h in zip(lo, hi)]
+    assert flux == pytest.approx(expected, rel=1e-12)
+
+    # calc_kcorr uses the same code for the rest and observed frames.
+    z = 0.05
+    kcorr = calc_kcorr(data, mdl, z, 90, 95, 90, 95)
+    frest = calc_energy_flux(data, mdl, 90, 95)
+    fobs = calc_energy_flux(data, mdl, 90 * (1 + z), 95 * (1 + z))
+    assert kcorr == pytest.approx(frest / fobs, rel=1e-12)
+
+
+def test_flux_array_bands_invalid():
+    """The lo and hi arrays must match."""
+
+    data = ui.Data1DInt('x', [1, 2, 3], [2, 3, 4], [1, 1, 1])
+    mdl = PowLaw1D()
+    with pytest.raises(DataErr) as exc:
+        calc_photon_flux(data, mdl, [1, 2], [2, 3, 4])
+
+    assert str(exc.value) == 'size mismatch between lo and hi'
+
+    with pytest.raises(IOErr) as exc:
+        calc_photon_flux(data, mdl, [1, 3], [2, 2.5])
+
+    assert str(exc.value) == 'the energy range is not consistent, 3 !< 2.5'
+
+
+def test_sum2d_region_keeps_filter():
+    """Repeated region sums are correct and the data filter is unchanged."""
+
+    x1, x0 = np.mgrid[1:11, 1:21]
+    y = np.arange(x0.size)
+    data = DataIMG('img', x0.flatten(), x1.flatten(), y, shape=x0.shape)
+    data.notice2d('rect(1,1,5,5)')
+    mask = data.mask.copy()
+
+    reg = 'circle(10, 5, 3)'
+    expected = y[(x0.flatten() - 10)**2 + (x1.flatten() - 5)**2 <= 9].sum()
+    assert calc_data_sum2d(data, reg) == expected
+    assert calc_data_sum2d(data, reg) == expected
+
+    mdl = Const2D()
+    assert calc_model_sum2d(data, mdl, reg) == pytest.approx(29)
+
+    # A different region
+    assert calc_data_sum2d(data, 'rect(1,1,5,5)') == y[mask].sum()
+
+    # The data filter has not been changed
+    assert data.mask == pytest.approx(mask)
+    assert data.get_filter_expr() == 'Rectangle(1,1,5,5)'
+
+
+def test_sum2d_no_region():
+    """The whole data set is used, whatever the filter."""
+
+    x1, x0 = np.mgrid[1:11, 1:21]
+    y = np.arange(x0.size)
+    data = DataIMG('img', x0.flatten(), x1.flatten(), y, shape=x0.shape)
+    mdl = Const2D()
+
+    assert calc_data_sum2d(data) == y.sum()
+    assert calc_model_sum2d(data, mdl) == pytest.approx(200)
+    assert data.mask is True
+
+    data.notice2d('rect(1,1,5,5)')
+    mask = data.mask.copy()
+    assert calc_data_sum2d(data) == y.sum()
+    assert calc_model_sum2d(data, mdl) == pytest.approx(200)
+    assert data.mask == pytest.approx(mask)
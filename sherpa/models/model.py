@@ -437,12 +437,18 @@ def modelCacher1d(func):
             digest = hashfunc(token).digest()
             if digest in cache:
                 cache_ctr['hits'] += 1
+
+                # Move the entry to the end of the queue so that the
+                # least-recently used values are removed first.
+                #
+                queue.remove(digest)
+                queue.append(digest)
                 return cache[digest].copy()
 
         vals = func(cls, pars, xlo, *args, **kwargs)
 
         if use_caching:
-            # remove first item in queue and remove from cache
+            # remove the least-recently used item from the cache
             key = queue.pop(0)
             cache.pop(key, None)
 
@@ -684,8 +690,11 @@ class Model(NoNewAttributesAfterInit):
                           '--------\n' +
                           'thawedparmaxes, thawedparmins\n')
 
+    # The min and max values are read directly, rather than through
+    # their properties, as these are called repeatedly during a fit.
+    #
     def _get_thawed_par_mins(self):
-        return [p.min for p in self.pars if not p.frozen]
+        return [p._min for p in self.pars if not p.frozen]
 
     def _set_thawed_pars_mins(self, vals):
         tpars = [p for p in self.pars if not p.frozen]
@@ -721,7 +730,7 @@ class Model(NoNewAttributesAfterInit):
                              'thawedpars, thawedarhardmins, thawedparmaxes\n')
 
     def _get_thawed_par_maxes(self):
-        return [p.max for p in self.pars if not p.frozen]
+        return [p._max for p in self.pars if not p.frozen]
 
     def _set_thawed_pars_maxes(self, vals):
         tpars = [p for p in self.pars if not p.frozen]
@@ -194,6 +194,7 @@ fit.
 """
 
 import logging
+import operator
 import numpy
 from sherpa.utils import SherpaFloat, NoNewAttributesAfterInit
 from sherpa.utils.err import ParameterErr
@@ -217,6 +218,19 @@ __all__ = ('Parameter', 'CompositeParameter', 'ConstantParameter',
 tinyval = float(numpy.finfo(numpy.float32).tiny)
 hugeval = float(numpy.finfo(numpy.float32).max)
 
+# Special values that are displayed by name in the HTML output; the
+# angle versions are only used for parameters with units of radians.
+#
+_html_values = {hugeval: 'MAX', -hugeval: '-MAX',
+                tinyval: 'TINY', -tinyval: '-TINY'}
+_html_angles = {2 * numpy.pi: '2&#960;', -2 * numpy.pi: '-2&#960;',
+                numpy.pi: '&#960;', -numpy.pi: '-&#960;'}
+_html_angle_units = frozenset(['radian', 'radians'])
+
+# The types that can be stored as a parameter value without conversion.
+#
+_float_types = frozenset([float, SherpaFloat])
+
 
 def _make_set_limit(name):
     def _set_limit(self, val):
@@ -243,8 +257,7 @@ def _make_set_limit(name):
         # Due to complaints about having to rewrite existing user scripts,
         # downgrade the ParameterErr issued here to mere warnings.  Also,
         # set the value to the appropriate soft limit.
-        if hasattr(self, "_NoNewAttributesAfterInit__initialized") and \
-           self._NoNewAttributesAfterInit__initialized:
+        if self._NoNewAttributesAfterInit__initialized:
             if name == "_min" and (val > self.val):
                 self.val = val
                 warning(('parameter %s less than new minimum; %s reset to %g') % (self.fullname, self.fullname, self.val))
@@ -333,21 +346,36 @@ class Parameter(NoNewAttributesAfterInit):
     # is a link, to ensure that it isn't outside the parameter's
     # min/max range. See issue #742.
     #
+    # This is called a lot, so the attributes are accessed directly
+    # rather than through their properties.
+    #
     def _get_val(self):
         if hasattr(self, 'eval'):
             return self.eval()
-        if self.link is None:
+
+        link = self._link
+        if link is None:
             return self._val
 
-        val = self.link.val
-        if val < self.min:
-            raise ParameterErr('edge', self.fullname, 'minimum', self.min)
-        if val > self.max:
-            raise ParameterErr('edge', self.fullname, 'maximum', self.max)
+        val = link.val
+        if val < self._min:
+            raise ParameterErr('edge', self.fullname, 'minimum', self._min)
+        if val > self._max:
+            raise ParameterErr('edge', self.fullname, 'maximum', self._max)
 
         return val
 
+    # Writing back the current value is common (e.g. after a fit),
+    # so skip the conversion when nothing would change. The type
+    # check ensures that no conversion is needed, and the soft
+    # limits are still checked, since they may have changed.
+    #
     def _set_val(self, val):
+        if type(val) in _float_types and self._link is None and \
+           val == self._val and val == self._default_val and \
+           self._min <= val <= self._max:
+            return
+
         if isinstance(val, Parameter):
             self.link = val
         else:
@@ -380,11 +408,19 @@ class Parameter(NoNewAttributesAfterInit):
     def _get_default_val(self):
         if hasattr(self, 'eval'):
             return self.eval()
-        if self.link is not None:
-            return self.link.default_val
+
+        link = self._link
+        if link is not None:
+            return link.default_val
+
         return self._default_val
 
     def _set_default_val(self, default_val):
+        if type(default_val) in _float_types and self._link is None and \
+           default_val == self._default_val and \
+           self._min <= default_val <= self._max:
+            return
+
         if isinstance(default_val, Parameter):
             self.link = default_val
         else:
@@ -481,12 +517,15 @@ class Parameter(NoNewAttributesAfterInit):
             if self in link:
                 raise ParameterErr('linkcycle')
 
-            # Correctly test for link cycles in long trees.
+            # Correctly test for link cycles in long trees. The check
+            # above covers link itself, so start with its link, and
+            # stop once a cycle has been found.
             cycle = False
-            ll = link
+            ll = link.link
             while isinstance(ll, Parameter):
-                if ll == self or self in ll:
+                if ll is self or self in ll:
                     cycle = True
+                    break
                 ll = ll.link
 
             # Long cycles are overwritten BUG #12287
@@ -521,7 +560,7 @@ class Parameter(NoNewAttributesAfterInit):
                  frozen=False, alwaysfrozen=False, hidden=False, aliases=None):
         self.modelname = modelname
         self.name = name
-        self.fullname = '%s.%s' % (modelname, name)
+        self.fullname = f'{modelname}.{name}'
 
         self._hard_min = SherpaFloat(hard_min)
         self._hard_max = SherpaFloat(hard_max)
@@ -535,15 +574,30 @@ class Parameter(NoNewAttributesAfterInit):
 
         self.hidden = hidden
 
-        # Set validated attributes.  Access them via their properties so that
-        # validation takes place.
-        self.min = min
-        self.max = max
+        # Set validated attributes. The limits are checked against the
+        # hard limits here, rather than using the min/max and
+        # default_min/default_max properties, to avoid repeating the
+        # checks, but the value is set via its property so that it is
+        # validated (this also sets the default value).
+        #
+        min = SherpaFloat(min)
+        max = SherpaFloat(max)
+        for limit in (min, max):
+            if limit < self._hard_min:
+                raise ParameterErr('edge', self.fullname,
+                                   'hard minimum', self._hard_min)
+            if limit > self._hard_max:
+                raise ParameterErr('edge', self.fullname,
+                                   'hard maximum', self._hard_max)
+
+        self._min = min
+        self._max = max
+        self._default_min = min
+        self._default_max = max
+        self._link = None
+        self._val = None
+        self._default_val = None
         self.val = val
-        self.default_min = min
-        self.default_max = max
-        self.default_val = val
-        self.link = None
         self._guessed = False
 
         self.aliases = [a.lower() for a in aliases] if aliases is not None else []
@@ -554,9 +608,9 @@ class Parameter(NoNewAttributesAfterInit):
         return iter([self])
 
     def __repr__(self):
-        r = "<%s '%s'" % (type(self).__name__, self.name)
+        r = f"<{type(self).__name__} '{self.name}'"
         if self.modelname:
-            r += " of model '%s'" % self.modelname
+            r += f" of model '{self.modelname}'"
         r += '>'
         return r
 
@@ -566,18 +620,15 @@ class Parameter(NoNewAttributesAfterInit):
         else:
             linkstr = str(None)
 
-        return (('val         = %s\n' +
-                 'min         = %s\n' +
-                 'max         = %s\n' +
-                 'units       = %s\n' +
-                 'frozen      = %s\n' +
-                 'link        = %s\n'
-                 'default_val = %s\n' +
-                 'default_min = %s\n' +
-                 'default_max = %s') %
-                (str(self.val), str(self.min), str(self.max), self.units,
-                 self.frozen, linkstr, str(self.default_val),
-                 str(self.default_min), str(self.default_max)))
+        return (f'val         = {self.val}\n'
+                f'min         = {self.min}\n'
+                f'max         = {self.max}\n'
+                f'units       = {self.units}\n'
+                f'frozen      = {self.frozen}\n'
+                f'link        = {linkstr}\n'
+                f'default_val = {self.default_val}\n'
+                f'default_min = {self.default_min}\n'
+                f'default_max = {self.default_max}')
 
     # Support 'rich display' representations
     #
@@ -593,28 +644,14 @@ class Parameter(NoNewAttributesAfterInit):
         # The use of equality rather than some form of tolerance
         # should be okay here.
         #
-        if v == hugeval:
-            return 'MAX'
-        elif v == -hugeval:
-            return '-MAX'
-        elif v == tinyval:
-            return 'TINY'
-        elif v == -tinyval:
-            return '-TINY'
-
-        if self.units in ['radian', 'radians']:
-            tau = 2 * numpy.pi
-
-            if v == tau:
-                return '2&#960;'
-            elif v == -tau:
-                return '-2&#960;'
-            elif v == numpy.pi:
-                return '&#960;'
-            elif v == -numpy.pi:
-                return '-&#960;'
-
-        return str(v)
+        out = _html_values.get(v)
+        if out is None and self.units in _html_angle_units:
+            out = _html_angles.get(v)
+
+        if out is None:
+            return str(v)
+
+        return out
 
     def _units_to_html(self):
         """Convert the unit to HTML.
@@ -630,19 +667,23 @@ class Parameter(NoNewAttributesAfterInit):
         """
         return html_parameter(self)
 
+    # The parameter values are scalars (SherpaFloat), so the
+    # operators are used rather than the NumPy ufuncs, which avoids
+    # the ufunc overhead but gives the same results.
+    #
     # Unary operations
-    __neg__ = _make_unop(numpy.negative, '-')
-    __abs__ = _make_unop(numpy.absolute, 'abs')
+    __neg__ = _make_unop(operator.neg, '-')
+    __abs__ = _make_unop(operator.abs, 'abs')
 
     # Binary operations
-    __add__, __radd__ = _make_binop(numpy.add, '+')
-    __sub__, __rsub__ = _make_binop(numpy.subtract, '-')
-    __mul__, __rmul__ = _make_binop(numpy.multiply, '*')
-    __div__, __rdiv__ = _make_binop(numpy.divide, '/')
-    __floordiv__, __rfloordiv__ = _make_binop(numpy.floor_divide, '//')
-    __truediv__, __rtruediv__ = _make_binop(numpy.true_divide, '/')
-    __mod__, __rmod__ = _make_binop(numpy.remainder, '%')
-    __pow__, __rpow__ = _make_binop(numpy.power, '**')
+    __add__, __radd__ = _make_binop(operator.add, '+')
+    __sub__, __rsub__ = _make_binop(operator.sub, '-')
+    __mul__, __rmul__ = _make_binop(operator.mul, '*')
+    __div__, __rdiv__ = _make_binop(operator.truediv, '/')
+    __floordiv__, __rfloordiv__ = _make_binop(operator.floordiv, '//')
+    __truediv__, __rtruediv__ = _make_binop(operator.truediv, '/')
+    __mod__, __rmod__ = _make_binop(operator.mod, '%')
+    __pow__, __rpow__ = _make_binop(operator.pow, '**')
 
     def freeze(self):
         """Set the `frozen` attribute for the parameter.
@@ -701,16 +742,27 @@ class Parameter(NoNewAttributesAfterInit):
         # However, it means that the logic here has to handle cases
         # of 'set(val=1, min=0, max=2)' but a value of 1 lies
         # outside the min/max of the object before the call, and
-        # we don't want the call to fail because of this.
+        # we don't want the call to fail because of this. Limits that
+        # widen the range are set first, and those that narrow it
+        # after the values have been changed, so each is only set
+        # once.
         #
-        if max is not None and max > self.max:
+        set_max = max is not None and max > self.max
+        if set_max:
             self.max = max
-        if default_max is not None and default_max > self.default_max:
+
+        set_default_max = default_max is not None and \
+            default_max > self.default_max
+        if set_default_max:
             self.default_max = default_max
 
-        if min is not None and min < self.min:
+        set_min = min is not None and min < self.min
+        if set_min:
             self.min = min
-        if default_min is not None and default_min < self.default_min:
+
+        set_default_min = default_min is not None and \
+            default_min < self.default_min
+        if set_default_min:
             self.default_min = default_min
 
         if val is not None:
@@ -718,14 +770,14 @@ class Parameter(NoNewAttributesAfterInit):
         if default_val is not None:
             self.default_val = default_val
 
-        if min is not None:
+        if min is not None and not set_min:
             self.min = min
-        if max is not None:
+        if max is not None and not set_max:
             self.max = max
 
-        if default_min is not None:
+        if default_min is not None and not set_default_min:
             self.default_min = default_min
-        if default_max is not None:
+        if default_max is not None and not set_default_max:
             self.default_max = default_max
 
         if frozen is not None:
@@ -774,16 +826,21 @@ class CompositeParameter(Parameter):
         return iter(self._get_parts())
 
     def _get_parts(self):
+        # Walk the expression tree with a stack, rather than recursion,
+        # returning the parts in the same (depth-first) order.
+        #
         parts = []
+        stack = list(reversed(self.parts))
+        while stack:
+            p = stack.pop()
 
-        for p in self.parts:
             # A CompositeParameter should not hold a reference to itself
             assert (p is not self), (("'%s' object holds a reference to " +
                                       "itself") % type(self).__name__)
 
             parts.append(p)
             if isinstance(p, CompositeParameter):
-                parts.extend(p._get_parts())
+                stack.extend(reversed(p.parts))
 
         # FIXME: do we want to remove duplicate components from parts?
 
@@ -804,6 +861,15 @@ class ConstantParameter(CompositeParameter):
     def eval(self):
         return self.value
 
+    # Constants are common in link expressions, so skip the checks
+    # made by Parameter._get_val.
+    #
+    def _get_val(self):
+        return self.value
+
+    val = property(_get_val, Parameter._set_val,
+                   doc='The value of the constant.')
+
 
 class UnaryOpParameter(CompositeParameter):
     """Apply an operator to a parameter expression.
@@ -812,7 +878,7 @@ class UnaryOpParameter(CompositeParameter):
     ----------
     arg : Parameter instance
     op : function reference
-        The ufunc to apply to the parameter value.
+        The function to apply to the parameter value.
     opstr : str
         The symbol used to represent the operator.
 
@@ -825,7 +891,7 @@ class UnaryOpParameter(CompositeParameter):
         self.arg = arg
         self.op = op
         CompositeParameter.__init__(self,
-                                    '%s(%s)' % (opstr, self.arg.fullname),
+                                    f'{opstr}({self.arg.fullname})',
                                     (self.arg,))
 
     def eval(self):
@@ -842,7 +908,7 @@ class BinaryOpParameter(CompositeParameter):
     rhs : Parameter instance
         The right-hand side of the expression.
     op : function reference
-        The ufunc to apply to the two parameter values.
+        The function to apply to the two parameter values.
     opstr : str
         The symbol used to represent the operator.
 
@@ -861,9 +927,9 @@ class BinaryOpParameter(CompositeParameter):
         self.lhs = self.wrapobj(lhs)
         self.rhs = self.wrapobj(rhs)
         self.op = op
-        CompositeParameter.__init__(self, '(%s %s %s)' %
-                                    (self.lhs.fullname, opstr,
-                                     self.rhs.fullname), (self.lhs, self.rhs))
+        CompositeParameter.__init__(self,
+                                    f'({self.lhs.fullname} {opstr} {self.rhs.fullname})',
+                                    (self.lhs, self.rhs))
 
     def eval(self):
         return self.op(self.lhs.val, self.rhs.val)
@@ -871,6 +937,13 @@ class BinaryOpParameter(CompositeParameter):
 
 # Notebook representation
 #
+# The header for the HTML table created by html_parameter.
+#
+_html_parameter_header = ''.join(f'<th>{col}</th>' for col in
+                                 ['Component', 'Parameter', 'Thawed',
+                                  'Value', 'Min', 'Max', 'Units'])
+
+
 def html_parameter(par):
     """Construct the HTML to display the parameter."""
 
@@ -879,45 +952,37 @@ def html_parameter(par):
     #
     def addtd(val):
         "Use the parameter to convert to HTML"
-        return '<td>{}</td>'.format(par._val_to_html(val))
-
-    out = '<table class="model">'
-    out += '<thead><tr>'
-    cols = ['Component', 'Parameter', 'Thawed', 'Value',
-            'Min', 'Max', 'Units']
-    for col in cols:
-        out += '<th>{}</th>'.format(col)
+        return f'<td>{par._val_to_html(val)}</td>'
 
-    out += '</tr></thead><tbody><tr>'
-
-    out += '<th class="model-odd">{}</th>'.format(par.modelname)
-    out += '<td>{}</td>'.format(par.name)
+    out = ['<table class="model"><thead><tr>',
+           _html_parameter_header,
+           '</tr></thead><tbody><tr>',
+           f'<th class="model-odd">{par.modelname}</th>',
+           f'<td>{par.name}</td>']
 
     linked = par.link is not None
     if linked:
-        out += "<td>linked</td>"
+        out.append("<td>linked</td>")
+    elif par.frozen:
+        out.append('<td><input disabled type="checkbox"></input></td>')
     else:
-        out += '<td><input disabled type="checkbox"'
-        if not par.frozen:
-            out += ' checked'
-        out += '></input></td>'
+        out.append('<td><input disabled type="checkbox" checked></input></td>')
 
-    out += addtd(par.val)
+    out.append(addtd(par.val))
     if linked:
         # 8592 is single left arrow
         # 8656 is double left arrow
         #
         val = formatting.clean_bracket(par.link.fullname)
-        out += '<td colspan="2">&#8656; {}</td>'.format(val)
+        out.append(f'<td colspan="2">&#8656; {val}</td>')
 
     else:
-        out += addtd(par.min)
-        out += addtd(par.max)
-
-    out += '<td>{}</td>'.format(par._units_to_html())
-    out += '</tr>'
+        out.append(addtd(par.min))
+        out.append(addtd(par.max))
 
-    out += '</tbody></table>'
+    out.append(f'<td>{par._units_to_html()}</td>')
+    out.append('</tr></tbody></table>')
 
-    ls = ['<details open><summary>Parameter</summary>' + out + '</details>']
+    ls = ['<details open><summary>Parameter</summary>' + ''.join(out) +
+          '</details>']
     return formatting.html_from_sections(par, ls)
@@ -1160,6 +1160,32 @@ def test_cache_clear_single(caplog):
     assert p._cache_ctr['misses'] == 0
 
 
+def test_cache_is_lru():
+    """The least-recently used evaluation is removed from the cache."""
+
+    p = Polynom1D()
+    p.startup(cache=True)
+    assert len(p._queue) == 5
+
+    grids = [numpy.arange(n) for n in range(2, 8)]
+    for grid in grids[:5]:
+        p(grid)
+
+    # Access the first grid so the second one should be dropped.
+    p(grids[0])
+    p(grids[5])
+    assert p._cache_ctr['hits'] == 1
+    assert p._cache_ctr['misses'] == 6
+
+    p(grids[0])
+    assert p._cache_ctr['hits'] == 2
+
+    p(grids[1])
+    assert p._cache_ctr['hits'] == 2
+    assert p._cache_ctr['misses'] == 7
+    assert len(p._cache) == 5
+
+
 def test_cache_clear_multiple(caplog):
     """Check cache_clear for a combined model."""
 
@@ -20,6 +20,7 @@
 
 import operator
 
+import numpy
 from numpy import arange
 
 import pytest
@@ -158,6 +159,59 @@ def test_link():
         p.link = 3 * p + 2
 
 
+def test_link_long_cycle():
+    """A cycle through several links removes the first link."""
+
+    a = Parameter('m', 'a', 2)
+    b = Parameter('m', 'b', 3)
+    c = Parameter('m', 'c', 4)
+    a.link = b
+    b.link = 2 * c
+
+    c.link = a
+    assert c.link is a
+    assert a.link is None
+    assert c.val == 2
+
+
+def test_set_val_unchanged():
+    """Setting the current value still updates the default value"""
+
+    p = Parameter('m', 'a', 2)
+    p.default_val = 3
+    assert p.val == pytest.approx(2)
+    assert p.default_val == pytest.approx(3)
+
+    p.val = p.val
+    assert p.val == pytest.approx(2)
+    assert p.default_val == pytest.approx(2)
+
+    q = Parameter('m', 'q', 4)
+    p.val = q
+    p.val = q.val
+    assert p.link is None
+    assert p.val == pytest.approx(4)
+
+
+@pytest.mark.parametrize("attr", ["val", "default_val"])
+@pytest.mark.parametrize("limit,value,label",
+                         [("thawedparmins", 10, "minimum"),
+                          ("thawedparmaxes", -10, "maximum")])
+def test_set_val_unchanged_checks_limits(attr, limit, value, label):
+    """Setting the current value still checks the soft limits
+
+    The thawedparmins/maxes setters of a model change the limits
+    without changing the parameter value.
+    """
+
+    mdl = Const1D('m')
+    setattr(mdl, limit, [value])
+    with pytest.raises(ParameterErr) as exc:
+        setattr(mdl.c0, attr, getattr(mdl.c0, attr))
+
+    assert str(exc.value) == f'parameter m.c0 has a {label} of {value}'
+
+
 def test_iter():
     p = setUp_p()
     for part in p:
@@ -189,6 +243,19 @@ def test_binop(op):
         assert comb.val == op(p.val, p2.val)
 
 
+def test_binop_invalid_values():
+    """Invalid operations follow the NumPy rules rather than raising."""
+
+    p = Parameter('model', 'p', 2)
+    p2 = Parameter('model', 'p2', 0)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        assert (p / p2).val == numpy.inf
+        assert numpy.isnan(((-p) ** 0.5).val)
+
+    assert isinstance((p + p2).val, SherpaFloat)
+
+
 def test_iter_composite():
     p, p2 = setUp_composite()
     pnew = 3 * p + p2
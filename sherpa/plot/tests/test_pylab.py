@@ -28,7 +28,7 @@ from sherpa.data import Data1D, Data1DInt
 from sherpa.models.basic import Const1D
 from sherpa.stats import Chi2DataVar
 from sherpa.plot import DataPlot, ModelHistogramPlot, \
-    DelchiPlot, RatioPlot, ResidPlot
+    DelchiPlot, RatioPlot, ResidPlot, JointPlot
 
 
 @requires_pylab
@@ -129,3 +129,52 @@ def test_warning_plot_hist_linecolor(caplog):
     assert lname == 'sherpa.plot.pylab_backend'
     assert lvl == logging.WARNING
     assert msg == 'The linecolor attribute (mousey) is unused.'
+
+
+@requires_pylab
+def test_jointplot_resets_figure():
+    """A repeated joint plot starts from a cleared figure."""
+
+    from matplotlib import pyplot as plt
+
+    data = Data1D('tst', np.asarray([1, 2, 3]), np.asarray([10, 12, 10.5]))
+    mdl = Const1D()
+    dplot = DataPlot()
+    dplot.prepare(data, stat=None)
+    rplot = ResidPlot()
+    rplot.prepare(data, mdl, stat=Chi2DataVar())
+
+    jplot = JointPlot()
+    jplot.plottop(dplot)
+    jplot.plotbot(rplot)
+
+    fig = plt.gcf()
+    axes = fig.axes
+    assert len(axes) == 2
+
+    # The X-axis tick labels are only shown for the bottom plot.
+    def labels_visible(ax):
+        return [t.label1.get_visible() for t in ax.xaxis.get_major_ticks()]
+
+    assert not any(labels_visible(axes[0]))
+    assert all(labels_visible(axes[1]))
+
+    # Add a figure-level artist and make the top tick labels visible.
+    fig.suptitle('hello')
+    axes[0].tick_params(labelbottom=True)
+    assert all(labels_visible(axes[0]))
+
+    jplot.reset()
+    jplot.plottop(dplot)
+    jplot.plotbot(rplot)
+
+    fig = plt.gcf()
+    assert len(fig.axes) == 2
+    assert fig.axes[0] is not axes[0]
+    assert fig.axes[1] is not axes[1]
+    assert len(fig.axes[0].lines) == 1
+    assert fig._suptitle is None
+    assert not any(labels_visible(fig.axes[0]))
+    assert all(labels_visible(fig.axes[1]))
+
+    plt.close()
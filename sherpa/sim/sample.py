@@ -217,7 +217,7 @@ class ParameterScaleVector(ParameterScale):
                 emsg = "scales option must be iterable of " + \
                        "length {}".format(len(thawedpars))
                 raise TypeError(emsg)
-            scales = list(map(abs, myscales))
+            scales = numpy.abs(numpy.asarray(myscales))
         scales = numpy.asarray(scales).transpose()
         return scales
 
@@ -356,17 +356,16 @@ class ParameterSample(NoNewAttributesAfterInit):
         else:
             raise ValueError('invalid clip argument: sent {}'.format(clip))
 
-        for pvals, pmin, pmax in zip(samples.T, mins, maxs):
-            porig = pvals.copy()
-
-            # do the clipping in place
-            numpy.clip(pvals, pmin, pmax, out=pvals)
-
-            # update the clipped array (which is True if a
-            # value on the row has been clipped).
-            #
-            clipped |= (pvals != porig)
-
+        # A value is clipped if it lies outside the limits, so the
+        # clipped flag can be calculated for all rows at once, before
+        # the clipping is done (in place) on the whole array. NaN
+        # values are also flagged, since they can not be clipped.
+        #
+        mins = numpy.asarray(mins)
+        maxs = numpy.asarray(maxs)
+        outside = (samples < mins) | (samples > maxs) | numpy.isnan(samples)
+        numpy.logical_or.reduce(outside, axis=1, out=clipped)
+        numpy.clip(samples, mins, maxs, out=samples)
         return clipped
 
 
@@ -435,9 +434,12 @@ class NormalParameterSampleFromScaleVector(ParameterSampleFromScaleVector):
 
     """
 
-    def get_sample(self, fit, myscales=None, num=1):
+    def get_sample(self, fit, myscales=None, num=1, rng=None):
         """Return the parameter samples.
 
+        .. versionchanged:: 4.14.1
+           The rng parameter was added.
+
         Parameters
         ----------
         fit : sherpa.fit.Fit instance
@@ -448,6 +450,9 @@ class NormalParameterSampleFromScaleVector(ParameterSampleFromScaleVector):
             it is calculated from the fit object.
         num : int, optional
             The number of samples to return.
+        rng : numpy.random.Generator or None, optional
+            The random number generator to use. If None then the
+            legacy numpy.random functions are used.
 
         Returns
         -------
@@ -457,10 +462,22 @@ class NormalParameterSampleFromScaleVector(ParameterSampleFromScaleVector):
 
         """
         vals = numpy.array(fit.model.thawedpars)
-        scales = self.scale.get_scales(fit, myscales)
-        samples = [numpy.random.normal(
-            val, scale, int(num)) for val, scale in zip(vals, scales)]
-        return numpy.asarray(samples).T
+        scales = numpy.asarray(self.scale.get_scales(fit, myscales))
+        num = int(num)
+        if rng is None:
+            # The draws are made parameter by parameter (the rows of
+            # the array) so that the values match those from calling
+            # numpy.random.normal separately for each parameter.
+            #
+            samples = numpy.random.standard_normal((vals.size, num))
+            samples *= scales[:, numpy.newaxis]
+            samples += vals[:, numpy.newaxis]
+            return samples.T
+
+        samples = rng.standard_normal((num, vals.size))
+        samples *= scales
+        samples += vals
+        return samples
 
 
 class NormalParameterSampleFromScaleMatrix(ParameterSampleFromScaleMatrix):
@@ -473,9 +490,12 @@ class NormalParameterSampleFromScaleMatrix(ParameterSampleFromScaleMatrix):
 
     """
 
-    def get_sample(self, fit, mycov=None, num=1):
+    def get_sample(self, fit, mycov=None, num=1, rng=None):
         """Return the parameter samples.
 
+        .. versionchanged:: 4.14.1
+           The rng parameter was added.
+
         Parameters
         ----------
         fit : sherpa.fit.Fit instance
@@ -486,6 +506,9 @@ class NormalParameterSampleFromScaleMatrix(ParameterSampleFromScaleMatrix):
             calculated from the fit object.
         num : int, optional
             The number of samples to return.
+        rng : numpy.random.Generator or None, optional
+            The random number generator to use. If None then the
+            legacy numpy.random functions are used.
 
         Returns
         -------
@@ -496,7 +519,25 @@ class NormalParameterSampleFromScaleMatrix(ParameterSampleFromScaleMatrix):
         """
         vals = numpy.array(fit.model.thawedpars)
         cov = self.scale.get_scales(fit, mycov)
-        return numpy.random.multivariate_normal(vals, cov, int(num))
+        if rng is None:
+            return numpy.random.multivariate_normal(vals, cov, int(num))
+
+        # The scale object has already checked that the covariance
+        # matrix is positive definite, so the Cholesky decomposition
+        # can be used rather than the (slower) default SVD method.
+        # It is calculated once for all num samples. A nearly-singular
+        # matrix can pass the check but fail the decomposition, in
+        # which case the SVD method is used.
+        #
+        try:
+            factor = numpy.linalg.cholesky(cov)
+        except numpy.linalg.LinAlgError:
+            return rng.multivariate_normal(vals, cov, int(num))
+
+        samples = rng.standard_normal((int(num), vals.size))
+        samples = samples @ factor.T
+        samples += vals
+        return samples
 
 
 class StudentTParameterSampleFromScaleMatrix(ParameterSampleFromScaleMatrix):
@@ -22,9 +22,14 @@ See sherpa/astro/sim/tests_astro_sim_unit.py for the astro-specific
 version of this.
 """
 
+import numpy as np
+
 import pytest
 
 from sherpa import sim
+from sherpa.data import Data1D
+from sherpa.fit import Fit
+from sherpa.models.basic import Polynom1D
 from sherpa.stats import LeastSq
 
 
@@ -101,3 +106,143 @@ def test_lrt_dows_not_like_gaussian():
 
     emsg = 'Sherpa fit statistic must be Cash or CStat for likelihood ratio test'
     assert str(exc.value) == emsg
+
+
+@pytest.mark.parametrize("clip,expected",
+                         [("none", [[-5, 2], [0, 30], [-5, 30], [1, 2]]),
+                          ("soft", [[-2, 2], [0, 20], [-2, 20], [1, 2]])])
+def test_sample_clip(clip, expected):
+    """Check the clipping is applied to all rows and columns."""
+
+    mdl = Polynom1D()
+    mdl.c1.thaw()
+    mdl.c0.min = -2
+    mdl.c1.max = 20
+    fit = Fit(Data1D('x', [1, 2, 3], [1, 2, 3]), mdl)
+
+    samples = np.asarray([[-5, 2], [0, 30], [-5, 30], [1, 2]], dtype=float)
+    clipped = sim.NormalParameterSampleFromScaleVector().clip(fit, samples, clip=clip)
+    assert samples == pytest.approx(np.asarray(expected))
+    assert clipped.dtype == bool
+    if clip == 'none':
+        assert not clipped.any()
+    else:
+        assert clipped == pytest.approx([True, True, True, False])
+
+
+@pytest.mark.parametrize("clip", ["hard", "soft"])
+def test_sample_clip_nan(clip):
+    """A row containing a NaN is marked as clipped."""
+
+    mdl = Polynom1D()
+    mdl.c1.thaw()
+    fit = Fit(Data1D('x', [1, 2, 3], [1, 2, 3]), mdl)
+
+    samples = np.asarray([[1, 2], [np.nan, 2], [1, np.nan], [3, 4]])
+    clipped = sim.NormalParameterSampleFromScaleVector().clip(fit, samples, clip=clip)
+    assert clipped == pytest.approx([False, True, True, False])
+
+
+@pytest.mark.parametrize("sampler,scales",
+                         [(sim.NormalParameterSampleFromScaleVector,
+                           [0.5, 2]),
+                          (sim.NormalParameterSampleFromScaleMatrix,
+                           np.asarray([[0.25, 0.1], [0.1, 4]]))])
+def test_sample_rng(sampler, scales):
+    """Check the rng argument is used to create the samples."""
+
+    mdl = Polynom1D()
+    mdl.c0 = 2
+    mdl.c1 = -10
+    mdl.c1.thaw()
+    fit = Fit(Data1D('x', [1, 2, 3], [1, 2, 3]), mdl)
+
+    s1 = sampler().get_sample(fit, scales, num=1000,
+                              rng=np.random.default_rng(3827))
+    s2 = sampler().get_sample(fit, scales, num=1000,
+                              rng=np.random.default_rng(3827))
+    assert s1.shape == (1000, 2)
+    assert s1 == pytest.approx(s2)
+
+    # Loose check of the distribution
+    assert s1.mean(axis=0) == pytest.approx([2, -10], abs=0.2)
+    assert s1.std(axis=0) == pytest.approx([0.5, 2], rel=0.1)
+
+
+def test_sample_rng_matches_cholesky():
+    """The Generator path matches multivariate_normal with Cholesky."""
+
+    mdl = Polynom1D()
+    mdl.c0 = 2
+    mdl.c1 = -10
+    mdl.c1.thaw()
+    fit = Fit(Data1D('x', [1, 2, 3], [1, 2, 3]), mdl)
+
+    cov = np.asarray([[4.0, 1.0], [1.0, 9.0]])
+    sampler = sim.NormalParameterSampleFromScaleMatrix()
+    got = sampler.get_sample(fit, cov, num=5,
+                             rng=np.random.default_rng(2384))
+
+    rng = np.random.default_rng(2384)
+    expected = rng.multivariate_normal([2, -10], cov, 5, method='cholesky')
+    assert got == pytest.approx(expected)
+
+
+def test_sample_rng_rank_deficient():
+    """A rank-deficient matrix that passes the check can be sampled."""
+
+    mdl = Polynom1D()
+    mdl.c1.thaw()
+    mdl.c2.thaw()
+    fit = Fit(Data1D('x', [1, 2, 3], [1, 2, 3]), mdl)
+
+    a = np.asarray([[1, 1, 1], [1, 0.5, 0.2]]).T
+    cov = a @ a.T
+    if np.linalg.eigvalsh(cov).min() <= 0:
+        pytest.skip("covariance matrix fails the eigenvalue check")
+
+    try:
+        np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        pass
+    else:
+        pytest.skip("Cholesky decomposition of the covariance matrix succeeds")
+
+    sampler = sim.NormalParameterSampleFromScaleMatrix()
+    got = sampler.get_sample(fit, cov, num=5,
+                             rng=np.random.default_rng(2384))
+
+    rng = np.random.default_rng(2384)
+    expected = rng.multivariate_normal(fit.model.thawedpars, cov, 5)
+    assert got == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("cov",
+                         [[[1.0, 2.0], [2.0, 1.0]],  # indefinite
+                          [[1.0, 1.0], [1.0, 1.0]],  # singular
+                          [[1.0, 0.0], [0.0, 0.0]]  # singular, diagonal
+                          ])
+def test_scale_matrix_not_positive_definite(cov):
+    """The covariance matrix must be positive definite."""
+
+    mdl = Polynom1D()
+    mdl.c1.thaw()
+    fit = Fit(Data1D('x', [1, 2, 3], [1, 2, 3]), mdl)
+
+    cov = np.asarray(cov)
+    with pytest.raises(TypeError) as exc:
+        sim.ParameterScaleMatrix().get_scales(fit, cov)
+
+    assert str(exc.value) == 'The covariance matrix is not positive definite'
+
+
+def test_scale_matrix_near_singular():
+    """A nearly-singular, but positive-definite, matrix is accepted."""
+
+    mdl = Polynom1D()
+    mdl.c1.thaw()
+    fit = Fit(Data1D('x', [1, 2, 3], [1, 2, 3]), mdl)
+
+    cov = np.asarray([[1.0, 1.0 - 1e-8], [1.0 - 1e-8, 1.0]])
+    got = sim.ParameterScaleMatrix().get_scales(fit, cov)
+    assert got == pytest.approx(cov)
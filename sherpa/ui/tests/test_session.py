@@ -27,6 +27,7 @@ from io import StringIO
 import logging
 from unittest.mock import patch
 
+import numpy as np
 from numpy.testing import assert_array_equal
 
 import pytest
@@ -479,6 +480,28 @@ def test_get_default_id():
     assert s.get_default_id() == 'alpha'
 
 
+def test_get_rng():
+    """Does the rng setting react correctly?"""
+    s = Session()
+    assert s.get_rng() is None
+
+    rng = np.random.default_rng(2)
+    s.set_rng(rng)
+    assert s.get_rng() is rng
+
+    s.clean()
+    assert s.get_rng() is None
+
+
+def test_set_rng_invalid():
+    """The rng must be a Generator"""
+    s = Session()
+    with pytest.raises(ArgumentTypeErr) as exc:
+        s.set_rng(23)
+
+    assert str(exc.value) == "'rng' must be a numpy.random.Generator or None"
+
+
 @pytest.mark.parametrize("name,req",
                          [('covar', est.Covariance),
                           ('conf', est.Confidence),
@@ -50,6 +50,37 @@ from sherpa.utils.err import ArgumentErr, ArgumentTypeErr, IdentifierErr
 from sherpa.utils.testing import requires_plotting, requires_pylab
 
 
+@pytest.fixture(autouse=True)
+def close_figures():
+    """Ensure any matplotlib figures are closed after each test."""
+
+    yield
+
+    try:
+        from matplotlib import pyplot as plt
+    except ImportError:
+        return
+
+    plt.close('all')
+
+
+@pytest.fixture
+def skip_draw(monkeypatch):
+    """Do not render matplotlib figures.
+
+    This is for tests which only check the plot objects in the
+    session, and not what matplotlib displays, since drawing the
+    figure is the most expensive part of these tests.
+    """
+
+    try:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+    except ImportError:
+        return
+
+    monkeypatch.setattr(FigureCanvasAgg, 'draw', lambda self: None)
+
+
 _data_x = [10, 20, 40, 90]
 _data_y = [10, 40, 30, 50]
 _data_y2 = [12, 45, 33, 49]
@@ -61,8 +92,8 @@ def example_data():
     # Note: we copy the x and y arrays just so there's no accidental
     # aliasing.
     #
-    x = [d for d in _data_x]
-    y = [d for d in _data_y]
+    x = np.array(_data_x)
+    y = np.array(_data_y)
     return ui.Data1D('example', x, y)
 
 
@@ -105,6 +136,14 @@ def calc_errors(ys):
     return Chi2Gehrels.calc_staterror(ys)
 
 
+# The example data, and errors, as arrays, to simplify the checks.
+#
+_y = np.asarray(_data_y)
+_y2 = np.asarray(_data_y2)
+_dy = calc_errors(_y)
+_dy2 = calc_errors(_y2)
+
+
 @pytest.mark.parametrize("idval", [None, 1, "one", 23])
 def test_get_fit_plot(idval, clean_ui):
     """Basic testing of get_fit_plot
@@ -216,7 +255,7 @@ def change_example(idval):
 
     d = ui.get_data(idval)
     # copy the values to ensure _data_y2 isn't changed by accident
-    d.y = [d for d in _data_y2]
+    d.y = np.array(_data_y2)
 
 
 def change_model(idval):
@@ -246,7 +285,7 @@ def check_example(xlabel='x'):
     assert dplot.xerr is None
 
     # Should use approximate equality here
-    assert dplot.yerr == pytest.approx(calc_errors(_data_y))
+    assert dplot.yerr == pytest.approx(_dy)
 
 
 def check_example_changed(xlabel='x'):
@@ -265,7 +304,7 @@ def check_example_changed(xlabel='x'):
     assert dplot.xerr is None
 
     # Should use approximate equality here
-    assert dplot.yerr == pytest.approx(calc_errors(_data_y2))
+    assert dplot.yerr == pytest.approx(_dy2)
 
 
 def check_model_plot(plot, title='Model', xlabel='x', modelval=35):
@@ -275,7 +314,7 @@ def check_model_plot(plot, title='Model', xlabel='x', modelval=35):
     assert plot.ylabel == 'y'
     assert plot.title == title
     assert plot.x == pytest.approx(_data_x)
-    assert plot.y == pytest.approx([modelval for x in _data_x])
+    assert plot.y == pytest.approx(np.full(len(_data_x), modelval))
     assert plot.xerr is None
     assert plot.yerr is None
 
@@ -323,9 +362,9 @@ def check_resid(title='Residuals for example'):
     assert rplot.ylabel == 'Data - Model'
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
-    assert rplot.y == pytest.approx([y - 35 for y in _data_y])
+    assert rplot.y == pytest.approx(_y - 35)
     assert rplot.xerr is None
-    assert rplot.yerr == pytest.approx(calc_errors(_data_y))
+    assert rplot.yerr == pytest.approx(_dy)
 
 
 def check_resid_changed(title='Residuals for example'):
@@ -339,9 +378,9 @@ def check_resid_changed(title='Residuals for example'):
     assert rplot.ylabel == 'Data - Model'
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
-    assert rplot.y == pytest.approx([y - 41 for y in _data_y])
+    assert rplot.y == pytest.approx(_y - 41)
     assert rplot.xerr is None
-    assert rplot.yerr == pytest.approx(calc_errors(_data_y))
+    assert rplot.yerr == pytest.approx(_dy)
 
 
 def check_resid_changed2(title='Residuals for example'):
@@ -355,9 +394,9 @@ def check_resid_changed2(title='Residuals for example'):
     assert rplot.ylabel == 'Data - Model'
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
-    assert rplot.y == pytest.approx([y - 41 for y in _data_y2])
+    assert rplot.y == pytest.approx(_y2 - 41)
     assert rplot.xerr is None
-    assert rplot.yerr == pytest.approx(calc_errors(_data_y2))
+    assert rplot.yerr == pytest.approx(_dy2)
 
 
 def check_ratio(title='Ratio of Data to Model for example'):
@@ -368,10 +407,9 @@ def check_ratio(title='Ratio of Data to Model for example'):
     assert rplot.ylabel == 'Data / Model'
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
-    assert rplot.y == pytest.approx([y / 35 for y in _data_y])
+    assert rplot.y == pytest.approx(_y / 35)
     assert rplot.xerr is None
-    dy = [dy / 35 for dy in calc_errors(_data_y)]
-    assert rplot.yerr == pytest.approx(dy)
+    assert rplot.yerr == pytest.approx(_dy / 35)
 
 
 def check_ratio_changed():
@@ -385,10 +423,9 @@ def check_ratio_changed():
     assert rplot.ylabel == 'Data / Model'
     assert rplot.title == 'Ratio of Data to Model for example'
     assert rplot.x == pytest.approx(_data_x)
-    assert rplot.y == pytest.approx([y / 35 for y in _data_y2])
+    assert rplot.y == pytest.approx(_y2 / 35)
     assert rplot.xerr is None
-    dy = [dy / 35 for dy in calc_errors(_data_y2)]
-    assert rplot.yerr == pytest.approx(dy)
+    assert rplot.yerr == pytest.approx(_dy2 / 35)
 
 
 def check_ratio_changed2(title='Ratio of Data to Model for example'):
@@ -402,10 +439,9 @@ def check_ratio_changed2(title='Ratio of Data to Model for example'):
     assert rplot.ylabel == 'Data / Model'
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
-    assert rplot.y == pytest.approx([y / 41 for y in _data_y2])
+    assert rplot.y == pytest.approx(_y2 / 41)
     assert rplot.xerr is None
-    dy = [dy / 41 for dy in calc_errors(_data_y2)]
-    assert rplot.yerr == pytest.approx(dy)
+    assert rplot.yerr == pytest.approx(_dy2 / 41)
 
 
 def check_delchi(title='Sigma Residuals for example'):
@@ -417,11 +453,9 @@ def check_delchi(title='Sigma Residuals for example'):
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
 
-    dy = calc_errors(_data_y)
-    assert rplot.y == pytest.approx([(y - 35) / dy
-                                     for y, dy in zip(_data_y, dy)])
+    assert rplot.y == pytest.approx((_y - 35) / _dy)
     assert rplot.xerr is None
-    assert rplot.yerr == pytest.approx([1.0 for y in _data_y])
+    assert rplot.yerr == pytest.approx(np.ones(4))
 
 
 def check_delchi_changed(title='Sigma Residuals for example'):
@@ -436,11 +470,9 @@ def check_delchi_changed(title='Sigma Residuals for example'):
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
 
-    dy = calc_errors(_data_y2)
-    assert rplot.y == pytest.approx([(y - 35) / dy
-                                     for y, dy in zip(_data_y2, dy)])
+    assert rplot.y == pytest.approx((_y2 - 35) / _dy2)
     assert rplot.xerr is None
-    assert rplot.yerr == pytest.approx([1.0 for y in _data_x])
+    assert rplot.yerr == pytest.approx(np.ones(4))
 
 
 def check_delchi_changed2(title='Sigma Residuals for example'):
@@ -455,11 +487,9 @@ def check_delchi_changed2(title='Sigma Residuals for example'):
     assert rplot.title == title
     assert rplot.x == pytest.approx(_data_x)
 
-    dy = calc_errors(_data_y2)
-    assert rplot.y == pytest.approx([(y - 41) / dy
-                                     for y, dy in zip(_data_y2, dy)])
+    assert rplot.y == pytest.approx((_y2 - 41) / _dy2)
     assert rplot.xerr is None
-    assert rplot.yerr == pytest.approx([1.0 for y in _data_x])
+    assert rplot.yerr == pytest.approx(np.ones(4))
 
 
 def check_chisqr():
@@ -471,9 +501,7 @@ def check_chisqr():
     assert rplot.title == '$\\chi^2$ for example'
     assert rplot.x == pytest.approx(_data_x)
 
-    dy = calc_errors(_data_y)
-    assert rplot.y == pytest.approx([((y - 35) / dy)**2
-                                     for y, dy in zip(_data_y, dy)])
+    assert rplot.y == pytest.approx(((_y - 35) / _dy)**2)
     assert rplot.xerr is None
     assert rplot.yerr is None
 
@@ -490,9 +518,7 @@ def check_chisqr_changed():
     assert rplot.title == '$\\chi^2$ for example'
     assert rplot.x == pytest.approx(_data_x)
 
-    dy = calc_errors(_data_y2)
-    assert rplot.y == pytest.approx([((y - 35) / dy)**2
-                                     for y, dy in zip(_data_y2, dy)])
+    assert rplot.y == pytest.approx(((_y2 - 35) / _dy2)**2)
     assert rplot.xerr is None
     assert rplot.yerr is None
 
@@ -600,11 +626,15 @@ _plot_replot_opts = [(p['plot'], p['change'], p['check']) for p in _plot_all]
 _plot_change_opts = [(p['plot'], p['change'], p['check_changed'])
                      for p in _plot_all]
 
+# Label the tests by the plot function.
+_plot_ids = [p['plot'].__name__ for p in _plot_all]
+
 
 @requires_plotting
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-@pytest.mark.parametrize("pfunc, checkfunc", _plot_opts)
-def test_plot_xxx(idval, pfunc, checkfunc, clean_ui):
+@pytest.mark.parametrize("idval", [None, "one", 23])
+@pytest.mark.parametrize("pfunc, checkfunc", _plot_opts,
+                         ids=_plot_ids)
+def test_plot_xxx(idval, pfunc, checkfunc, clean_ui, skip_draw):
     """Can we call a plot_xxx routine?
 
     There is limited testing that the plot call worked (this
@@ -638,9 +668,11 @@ def test_plot_xxx(idval, pfunc, checkfunc, clean_ui):
 
 
 @requires_plotting
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-@pytest.mark.parametrize("plotfunc,changefunc,checkfunc", _plot_replot_opts)
-def test_plot_xxx_replot(idval, plotfunc, changefunc, checkfunc, clean_ui):
+@pytest.mark.parametrize("idval", [None, "one", 23])
+@pytest.mark.parametrize("plotfunc,changefunc,checkfunc",
+                         _plot_replot_opts, ids=_plot_ids)
+def test_plot_xxx_replot(idval, plotfunc, changefunc, checkfunc, clean_ui,
+                         skip_draw):
     """Can we plot, change data, plot with replot and see no difference?
 
     Parameters
@@ -682,9 +714,11 @@ def test_plot_xxx_replot(idval, plotfunc, changefunc, checkfunc, clean_ui):
 
 
 @requires_plotting
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-@pytest.mark.parametrize("plotfunc,changefunc,checkfunc", _plot_change_opts)
-def test_plot_xxx_change(idval, plotfunc, changefunc, checkfunc, clean_ui):
+@pytest.mark.parametrize("idval", [None, "one", 23])
+@pytest.mark.parametrize("plotfunc,changefunc,checkfunc",
+                         _plot_change_opts, ids=_plot_ids)
+def test_plot_xxx_change(idval, plotfunc, changefunc, checkfunc, clean_ui,
+                         skip_draw):
     """Can we plot, change data, plot and see a difference?
 
     Unlike test_plot_xxx_replot, this does not set replot to True,
@@ -834,11 +868,19 @@ def test_plot_xdf(plotfunc):
     plotfunc(pvals)
 
 
-@pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_plot_psf(session):
-    """Very basic check we can call plot_psf/get_psf_plot
+def setup_psf(session):
+    """Create a session with a dataset and a gaussian PSF.
 
-    This can be run even without a plotting backend available.
+    Parameters
+    ----------
+    session : class
+        The Session class to use.
+
+    Returns
+    -------
+    s, x, psfmdl
+        The session, the independent axis of the dataset, and the
+        PSF model.
     """
 
     s = session()
@@ -853,6 +895,17 @@ def test_plot_psf(session):
     psfmdl.ampl = 2
     s.load_psf('psf', psfmdl)
     s.set_psf('psf')
+    return s, x, psfmdl
+
+
+@pytest.mark.parametrize("session", [BaseSession, AstroSession])
+def test_plot_psf(session):
+    """Very basic check we can call plot_psf/get_psf_plot
+
+    This can be run even without a plotting backend available.
+    """
+
+    s, x, psfmdl = setup_psf(session)
 
     s.plot_psf()
 
@@ -876,18 +929,7 @@ def test_get_psf_plot_recalc(session):
     This can be run even without a plotting backend available.
     """
 
-    s = session()
-    s._add_model_types(basic)
-
-    x = np.arange(10, 40, 2)
-    y = np.ones(x.size)
-    s.load_arrays(1, x, y)
-
-    psfmdl = s.create_model_component('gauss1d', 'psfmdl')
-    psfmdl.fwhm = 5
-    psfmdl.ampl = 2
-    s.load_psf('psf', psfmdl)
-    s.set_psf('psf')
+    s, x, psfmdl = setup_psf(session)
 
     yexp = psfmdl(x)
 
@@ -917,18 +959,7 @@ def test_plot_kernel(session, caplog):
     This can be run even without a plotting backend available.
     """
 
-    s = session()
-    s._add_model_types(basic)
-
-    x = np.arange(10, 40, 2)
-    y = np.ones(x.size)
-    s.load_arrays(1, x, y)
-
-    psfmdl = s.create_model_component('gauss1d', 'psfmdl')
-    psfmdl.fwhm = 5
-    psfmdl.ampl = 2
-    s.load_psf('psf', psfmdl)
-    s.set_psf('psf')
+    s, x, psfmdl = setup_psf(session)
 
     # TODO: check screen putput
     with caplog.at_level(logging.INFO, logger='sherpa'):
@@ -961,18 +992,7 @@ def test_get_kernel_plot_recalc(session):
     This can be run even without a plotting backend available.
     """
 
-    s = session()
-    s._add_model_types(basic)
-
-    x = np.arange(10, 40, 2)
-    y = np.ones(x.size)
-    s.load_arrays(1, x, y)
-
-    psfmdl = s.create_model_component('gauss1d', 'psfmdl')
-    psfmdl.fwhm = 5
-    psfmdl.ampl = 2
-    s.load_psf('psf', psfmdl)
-    s.set_psf('psf')
+    s, x, psfmdl = setup_psf(session)
 
     yexp = psfmdl(x)
     yexp /= yexp.sum()
@@ -1078,6 +1098,15 @@ def test_plot_contour_error_out_invalid(plottype, session):
     assert str(exc.value) == emsg
 
 
+def check_axes(ax, geometry, title, xlabel, ylabel):
+    """Check the layout and labels of a matplotlib axes."""
+
+    assert ax.get_subplotspec().get_geometry() == geometry
+    assert ax.get_title() == title
+    assert ax.get_xlabel() == xlabel
+    assert ax.get_ylabel() == ylabel
+
+
 @requires_pylab
 @pytest.mark.parametrize("session", [BaseSession, AstroSession])
 def test_plot_single(session):
@@ -1103,10 +1132,7 @@ def test_plot_single(session):
 
     ax = fig.axes[0]
 
-    assert ax.get_subplotspec().get_geometry() == (1, 1, 0, 0)
-    assert ax.get_title() == ''
-    assert ax.xaxis.get_label().get_text() == 'x'
-    assert ax.yaxis.get_label().get_text() == 'y'
+    check_axes(ax, (1, 1, 0, 0), '', 'x', 'y')
 
     plt.close()
 
@@ -1117,10 +1143,7 @@ def test_plot_single(session):
 
     ax = fig.axes[0]
 
-    assert ax.get_subplotspec().get_geometry() == (1, 1, 0, 0)
-    assert ax.get_title() == 'Model'
-    assert ax.xaxis.get_label().get_text() == 'x'
-    assert ax.yaxis.get_label().get_text() == 'y'
+    check_axes(ax, (1, 1, 0, 0), 'Model', 'x', 'y')
 
     plt.close()
 
@@ -1170,10 +1193,7 @@ def test_plot_multiple(session):
                                             1):
 
         w = i - 1
-        assert ax.get_subplotspec().get_geometry() == (2, 3, w, w)
-        assert ax.get_title() == title
-        assert ax.xaxis.get_label().get_text() == 'x'
-        assert ax.yaxis.get_label().get_text() == ylabel
+        check_axes(ax, (2, 3, w, w), title, 'x', ylabel)
 
         assert len(ax.lines) > 0
         assert ax.lines[0].get_alpha() == 0.8
@@ -1181,26 +1201,37 @@ def test_plot_multiple(session):
     plt.close()
 
 
-@requires_pylab
-@pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_contour_single(session):
-    """Can we call contour() with a single plot type?
+@pytest.fixture(scope="module")
+def contour_data():
+    """The x0, x1, and y values used by the contour tests.
 
-    There's no real way to test this without a backend.
+    The arrays are shared by the tests so they are marked as
+    read-only.
     """
 
-    from matplotlib import pyplot as plt
-
-    s = session()
-    s._add_model_types(basic)
-
     x1, x0 = np.mgrid[-4:5, 6:15]
 
     x0 = x0.flatten()
     x1 = x1.flatten()
     y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
+    for arr in (x0, x1, y):
+        arr.setflags(write=False)
 
-    s.load_arrays(1, x0, x1, y, Data2D)
+    return x0, x1, y
+
+
+@pytest.fixture
+def contour_session(session, contour_data):
+    """A session with the contour data and a gaussian source model.
+
+    The session argument is the Session class to use, so tests
+    must parametrize it.
+    """
+
+    s = session()
+    s._add_model_types(basic)
+
+    s.load_arrays(1, *contour_data, Data2D)
 
     mdl = s.create_model_component('gauss2d', 'mdl')
     mdl.xpos = 10
@@ -1209,6 +1240,20 @@ def test_contour_single(session):
     mdl.ampl = 100
 
     s.set_source(mdl)
+    return s
+
+
+@requires_pylab
+@pytest.mark.parametrize("session", [BaseSession, AstroSession])
+def test_contour_single(contour_session):
+    """Can we call contour() with a single plot type?
+
+    There's no real way to test this without a backend.
+    """
+
+    from matplotlib import pyplot as plt
+
+    s = contour_session
 
     s.contour("data")
 
@@ -1217,10 +1262,7 @@ def test_contour_single(session):
 
     ax = fig.axes[0]
 
-    assert ax.get_subplotspec().get_geometry() == (1, 1, 0, 0)
-    assert ax.get_title() == ''
-    assert ax.xaxis.get_label().get_text() == 'x0'
-    assert ax.yaxis.get_label().get_text() == 'x1'
+    check_axes(ax, (1, 1, 0, 0), '', 'x0', 'x1')
 
     plt.close()
 
@@ -1231,17 +1273,14 @@ def test_contour_single(session):
 
     ax = fig.axes[0]
 
-    assert ax.get_subplotspec().get_geometry() == (1, 1, 0, 0)
-    assert ax.get_title() == 'Model'
-    assert ax.xaxis.get_label().get_text() == 'x0'
-    assert ax.yaxis.get_label().get_text() == 'x1'
+    check_axes(ax, (1, 1, 0, 0), 'Model', 'x0', 'x1')
 
     plt.close()
 
 
 @requires_pylab
 @pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_contour_multiple(session):
+def test_contour_multiple(contour_session):
     """Can we call contour() with multiple plot types?
 
     There's no real way to test this without a backend.
@@ -1249,24 +1288,7 @@ def test_contour_multiple(session):
 
     from matplotlib import pyplot as plt
 
-    s = session()
-    s._add_model_types(basic)
-
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
-    s.load_arrays(1, x0, x1, y, Data2D)
-
-    mdl = s.create_model_component('gauss2d', 'mdl')
-    mdl.xpos = 10
-    mdl.ypos = 0
-    mdl.fwhm = 3
-    mdl.ampl = 100
-
-    s.set_source(mdl)
+    s = contour_session
 
     s.contour("data", "model", "source", "fit", "ratio")
 
@@ -1279,10 +1301,7 @@ def test_contour_multiple(session):
                                     1):
 
         w = i - 1
-        assert ax.get_subplotspec().get_geometry() == (2, 3, w, w)
-        assert ax.get_title() == title
-        assert ax.xaxis.get_label().get_text() == 'x0'
-        assert ax.yaxis.get_label().get_text() == 'x1'
+        check_axes(ax, (2, 3, w, w), title, 'x0', 'x1')
 
     plt.close()
 
@@ -1297,7 +1316,7 @@ def test_contour_multiple(session):
                           ("ratio", "Ratio of Data to Model", RatioContour),
                           ("fit", "", FitContour),
                           ("fit_resid", None, None)])
-def test_contour_xxx(plotfunc, title, pcls, session):
+def test_contour_xxx(plotfunc, title, pcls, contour_session):
     """Check we can call contour_xxx()/get_xxx_contour().
 
     There's no real way to test this without a backend.
@@ -1305,24 +1324,7 @@ def test_contour_xxx(plotfunc, title, pcls, session):
 
     from matplotlib import pyplot as plt
 
-    s = session()
-    s._add_model_types(basic)
-
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
-    s.load_arrays(1, x0, x1, y, Data2D)
-
-    mdl = s.create_model_component('gauss2d', 'mdl')
-    mdl.xpos = 10
-    mdl.ypos = 0
-    mdl.fwhm = 3
-    mdl.ampl = 100
-
-    s.set_source(mdl)
+    s = contour_session
 
     getattr(s, "contour_" + plotfunc)()
 
@@ -1336,19 +1338,13 @@ def test_contour_xxx(plotfunc, title, pcls, session):
                                         1):
 
             w = i - 1
-            assert ax.get_subplotspec().get_geometry() == (2, 1, w, w)
-            assert ax.get_title() == title
-            assert ax.xaxis.get_label().get_text() == 'x0'
-            assert ax.yaxis.get_label().get_text() == 'x1'
+            check_axes(ax, (2, 1, w, w), title, 'x0', 'x1')
 
     else:
         assert len(fig.axes) == 1
 
         ax = fig.axes[0]
-        assert ax.get_subplotspec().get_geometry() == (1, 1, 0, 0)
-        assert ax.get_title() == title
-        assert ax.xaxis.get_label().get_text() == 'x0'
-        assert ax.yaxis.get_label().get_text() == 'x1'
+        check_axes(ax, (1, 1, 0, 0), title, 'x0', 'x1')
 
         plot = getattr(s, "get_{}_contour".format(plotfunc))()
         assert isinstance(plot, pcls)
@@ -1610,7 +1606,7 @@ def test_plot_cdf_replot(session):
 
     ax = fig.axes[0]
 
-    assert ax.xaxis.get_label().get_text() == 'fo'
+    assert ax.get_xlabel() == 'fo'
 
     assert len(ax.lines) == 4
     line = ax.lines[0]
@@ -1820,7 +1816,7 @@ def test_plot_pdf_replot(session):
 
     ax = fig.axes[0]
 
-    assert ax.xaxis.get_label().get_text() == 'fo'
+    assert ax.get_xlabel() == 'fo'
 
     assert len(ax.lines) == 2
     line = ax.lines[0]
@@ -2120,6 +2116,13 @@ def test_fit_plot_recalc(session):
     assert p.modelplot.y == pytest.approx([30, 40, 50])
 
 
+# The number of simulations used for the p-value tests. It is kept
+# low since the tests do not check the p-value itself, but it must be
+# larger than the number of histogram bins (25 by default).
+#
+PVALUE_NUM = 30
+
+
 def check_pvalue(caplog, plot):
     """Is the output as expected?"""
 
@@ -2136,10 +2139,10 @@ def check_pvalue(caplog, plot):
     assert toks[3].startswith('likelihood ratio =  2.36')
 
     # The p-value is very sensitive so not really a useful check,
-    # and can sometimes get a < 1/nruns answer (and nruns=100).
+    # and can sometimes get a < 1/nruns answer (and nruns=PVALUE_NUM).
     #
     assert toks[4].startswith('p-value          =  0.') or \
-        toks[4].startswith('p-value          <  0.01')
+        toks[4] == f'p-value          <  {1 / PVALUE_NUM}'
 
     assert isinstance(plot, LRHistogram)
     assert plot.xlabel == 'Likelihood Ratio'
@@ -2178,7 +2181,8 @@ def test_get_pvalue_plot(session, caplog):
     s.set_source(bgnd)
 
     with caplog.at_level(logging.INFO, logger='sherpa'):
-        p = s.get_pvalue_plot(bgnd, bgnd+line, num=100, recalc=True)
+        p = s.get_pvalue_plot(bgnd, bgnd+line, num=PVALUE_NUM,
+                             recalc=True)
 
     check_pvalue(caplog, p)
 
@@ -2213,7 +2217,7 @@ def test_plot_pvalue(session, caplog):
     s.set_source(bgnd)
 
     with caplog.at_level(logging.INFO, logger='sherpa'):
-        s.plot_pvalue(bgnd, bgnd+line, num=100)
+        s.plot_pvalue(bgnd, bgnd+line, num=PVALUE_NUM)
 
     p = s.get_pvalue_plot(recalc=False)
     check_pvalue(caplog, p)
@@ -2296,8 +2300,8 @@ def test_pylab_plot_scatter_empty_replot(session):
 
     ax = fig.axes[0]
 
-    assert ax.xaxis.get_label().get_text() == ''
-    assert ax.yaxis.get_label().get_text() == ''
+    assert ax.get_xlabel() == ''
+    assert ax.get_ylabel() == ''
 
     assert len(ax.lines) == 1
     line = ax.lines[0]
@@ -2328,8 +2332,8 @@ def test_pylab_plot_scatter(session):
 
     ax = fig.axes[0]
 
-    assert ax.xaxis.get_label().get_text() == 'x'
-    assert ax.yaxis.get_label().get_text() == 'y'
+    assert ax.get_xlabel() == 'x'
+    assert ax.get_ylabel() == 'y'
 
     assert len(ax.lines) == 1
     line = ax.lines[0]
@@ -2382,8 +2386,8 @@ def test_pylab_plot_trace(session):
 
     ax = fig.axes[0]
 
-    assert ax.xaxis.get_label().get_text() == 'iteration'
-    assert ax.yaxis.get_label().get_text() == 'bob'
+    assert ax.get_xlabel() == 'iteration'
+    assert ax.get_ylabel() == 'bob'
     assert ax.get_title() == 'Trace: bob'
 
     assert len(ax.lines) == 1
@@ -2401,17 +2405,12 @@ def test_pylab_plot_trace(session):
 
 
 @pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_data_contour_recalc(session):
+def test_data_contour_recalc(session, contour_data):
     """Basic testing of get_data_contour(recalc=False)"""
 
     s = session()
 
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
+    x0, x1, y = contour_data
     s.load_arrays(1, x0, x1, y, Data2D)
 
     s.get_data_contour()
@@ -2438,70 +2437,21 @@ def test_data_contour_recalc(session):
 
 
 @pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_model_contour_recalc(session):
-    """Basic testing of get_model_contour(recalc=False)"""
-
-    s = session()
-    s._add_model_types(basic)
-
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
-    s.load_arrays(1, x0, x1, y, Data2D)
-
-    s.create_model_component('gauss2d', 'gmdl')
-    s.set_source('gmdl')
-
-    s.get_model_contour()
-
-    nx1, nx0 = np.mgrid[2:5, 12:15]
-
-    nx0 = x0.flatten()
-    nx1 = x1.flatten()
-    ny = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
-    s.load_arrays(1, nx0, nx1, ny, Data2D)
-
-    s.create_model_component('const2d', 'cmdl')
-    s.set_source('cmdl')
-
-    p = s.get_model_contour(recalc=False)
-    assert isinstance(p, ModelContour)
-    assert p.x0 == pytest.approx(x0)
-    assert p.x1 == pytest.approx(x1)
-    # just check the model isn't flat
-    assert p.y.min() < p.y.max()
-
-    p = s.get_model_contour(recalc=True)
-    assert isinstance(p, ModelContour)
-    assert p.x0 == pytest.approx(nx0)
-    assert p.x1 == pytest.approx(nx1)
-    # just check the model is flat
-    assert p.y.min() == p.y.max()
-
-
-@pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_source_contour_recalc(session):
-    """Basic testing of get_source_contour(recalc=False)"""
+@pytest.mark.parametrize("ptype", ["model", "source"])
+def test_model_contour_recalc(ptype, session, contour_data):
+    """Basic testing of get_model/source_contour(recalc=False)"""
 
     s = session()
     s._add_model_types(basic)
 
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
+    x0, x1, y = contour_data
     s.load_arrays(1, x0, x1, y, Data2D)
 
     s.create_model_component('gauss2d', 'gmdl')
     s.set_source('gmdl')
 
-    s.get_source_contour()
+    getfunc = getattr(s, f"get_{ptype}_contour")
+    getfunc()
 
     nx1, nx0 = np.mgrid[2:5, 12:15]
 
@@ -2514,14 +2464,14 @@ def test_source_contour_recalc(session):
     s.create_model_component('const2d', 'cmdl')
     s.set_source('cmdl')
 
-    p = s.get_source_contour(recalc=False)
+    p = getfunc(recalc=False)
     assert isinstance(p, ModelContour)
     assert p.x0 == pytest.approx(x0)
     assert p.x1 == pytest.approx(x1)
     # just check the model isn't flat
     assert p.y.min() < p.y.max()
 
-    p = s.get_source_contour(recalc=True)
+    p = getfunc(recalc=True)
     assert isinstance(p, ModelContour)
     assert p.x0 == pytest.approx(nx0)
     assert p.x1 == pytest.approx(nx1)
@@ -2530,72 +2480,21 @@ def test_source_contour_recalc(session):
 
 
 @pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_ratio_contour_recalc(session):
-    """Basic testing of get_ratio_contour(recalc=False)"""
-
-    s = session()
-    s._add_model_types(basic)
-
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
-    s.load_arrays(1, x0, x1, y, Data2D)
-
-    s.create_model_component('gauss2d', 'gmdl')
-    s.set_source('gmdl')
-
-    s.get_ratio_contour()
-
-    nx1, nx0 = np.mgrid[2:5, 12:15]
-
-    nx0 = x0.flatten()
-    nx1 = x1.flatten()
-    ny = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
-    s.load_arrays(1, nx0, nx1, ny, Data2D)
-
-    s.create_model_component('const2d', 'cmdl')
-    s.set_source('cmdl')
-
-    p = s.get_ratio_contour(recalc=False)
-    assert isinstance(p, ModelContour)
-    assert p.x0 == pytest.approx(x0)
-    assert p.x1 == pytest.approx(x1)
-    # just check the model isn't flat
-    assert p.y.min() < p.y.max()
-
-    p = s.get_ratio_contour(recalc=True)
-    assert isinstance(p, ModelContour)
-    assert p.x0 == pytest.approx(nx0)
-    assert p.x1 == pytest.approx(nx1)
-
-    ygood = np.isfinite(p.y)
-    assert ygood.sum() == ygood.size - 1
-    assert not ygood[40]
-
-
-@pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_resid_contour_recalc(session):
-    """Basic testing of get_resid_contour(recalc=False)"""
+@pytest.mark.parametrize("ptype", ["ratio", "resid"])
+def test_ratio_contour_recalc(ptype, session, contour_data):
+    """Basic testing of get_ratio/resid_contour(recalc=False)"""
 
     s = session()
     s._add_model_types(basic)
 
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
+    x0, x1, y = contour_data
     s.load_arrays(1, x0, x1, y, Data2D)
 
     s.create_model_component('gauss2d', 'gmdl')
     s.set_source('gmdl')
 
-    s.get_resid_contour()
+    getfunc = getattr(s, f"get_{ptype}_contour")
+    getfunc()
 
     nx1, nx0 = np.mgrid[2:5, 12:15]
 
@@ -2608,14 +2507,14 @@ def test_resid_contour_recalc(session):
     s.create_model_component('const2d', 'cmdl')
     s.set_source('cmdl')
 
-    p = s.get_resid_contour(recalc=False)
+    p = getfunc(recalc=False)
     assert isinstance(p, ModelContour)
     assert p.x0 == pytest.approx(x0)
     assert p.x1 == pytest.approx(x1)
     # just check the model isn't flat
     assert p.y.min() < p.y.max()
 
-    p = s.get_resid_contour(recalc=True)
+    p = getfunc(recalc=True)
     assert isinstance(p, ModelContour)
     assert p.x0 == pytest.approx(nx0)
     assert p.x1 == pytest.approx(nx1)
@@ -2626,18 +2525,13 @@ def test_resid_contour_recalc(session):
 
 
 @pytest.mark.parametrize("session", [BaseSession, AstroSession])
-def test_fit_contour_recalc(session):
+def test_fit_contour_recalc(session, contour_data):
     """Basic testing of get_fit_contour(recalc=False)"""
 
     s = session()
     s._add_model_types(basic)
 
-    x1, x0 = np.mgrid[-4:5, 6:15]
-
-    x0 = x0.flatten()
-    x1 = x1.flatten()
-    y = 100 / np.sqrt((x0 - 10)**2 + x1**2)
-
+    x0, x1, y = contour_data
     s.load_arrays(1, x0, x1, y, Data2D)
 
     s.create_model_component('gauss2d', 'gmdl')
@@ -2716,7 +2610,7 @@ def test_plot_fit_xxx_pylab(ptype, clean_ui):
         print('---')
 
     assert len(axes) == 2
-    assert axes[0].xaxis.get_label().get_text() == ''
+    assert axes[0].get_xlabel() == ''
 
     assert axes[0].xaxis.get_scale() == 'log'
     assert axes[0].yaxis.get_scale() == 'log'
@@ -2750,7 +2644,7 @@ def test_plot_fit_xxx_overplot_pylab(ptype, caplog, clean_ui):
     fig = plt.gcf()
     axes = fig.axes
     assert len(axes) == 2
-    assert axes[0].xaxis.get_label().get_text() == ''
+    assert axes[0].get_xlabel() == ''
 
     assert axes[0].xaxis.get_scale() == 'log'
     assert axes[0].yaxis.get_scale() == 'log'
@@ -2791,7 +2685,7 @@ def test_plot_fit_resid_handles_data_log(idval, clean_ui):
     fig = plt.gcf()
     axes = fig.axes
     assert len(axes) == 2
-    assert axes[0].xaxis.get_label().get_text() == ''
+    assert axes[0].get_xlabel() == ''
 
     assert axes[0].xaxis.get_scale() == 'log'
     assert axes[0].yaxis.get_scale() == 'linear'
@@ -2822,7 +2716,7 @@ def test_plot_fit_resid_handles_resid_log(idval, clean_ui):
     fig = plt.gcf()
     axes = fig.axes
     assert len(axes) == 2
-    assert axes[0].xaxis.get_label().get_text() == ''
+    assert axes[0].get_xlabel() == ''
 
     assert axes[0].xaxis.get_scale() == 'log'
     assert axes[0].yaxis.get_scale() == 'linear'
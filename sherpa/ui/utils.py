@@ -190,6 +190,11 @@ class Session(NoNewAttributesAfterInit):
         if '_sources' not in state:
             self.__dict__['_sources'] = state.pop('_models')
 
+        # Sessions saved before the random-number generator could
+        # be set.
+        #
+        state.setdefault('_rng', None)
+
         self.__dict__.update(state)
 
     ###########################################################################
@@ -236,6 +241,7 @@ class Session(NoNewAttributesAfterInit):
 
         self._default_id = 1
         self._paramprompt = False
+        self._rng = None
 
         self._methods = {}
         self._itermethods = {'none': {'name': 'none'},
@@ -1393,6 +1399,61 @@ class Session(NoNewAttributesAfterInit):
         """
         self._default_id = self._fix_id(id)
 
+    def get_rng(self):
+        """Return the random number generator used by the session.
+
+        .. versionadded:: 4.14.1
+
+        Returns
+        -------
+        rng : numpy.random.Generator or None
+           The generator used when sampling parameter values. A value
+           of ``None`` means that the legacy ``numpy.random``
+           functions are used.
+
+        See Also
+        --------
+        set_rng : Set the random number generator used by the session.
+
+        """
+        return self._rng
+
+    def set_rng(self, rng):
+        """Set the random number generator used by the session.
+
+        .. versionadded:: 4.14.1
+
+        Parameters
+        ----------
+        rng : numpy.random.Generator or None
+           The generator to use when sampling parameter values (for
+           example by `sample_energy_flux`). A value of ``None``, the
+           default, means that the legacy ``numpy.random`` functions
+           are used, so that ``numpy.random.seed`` can be used to
+           make the results repeatable.
+
+        See Also
+        --------
+        get_rng : Return the random number generator used by the session.
+
+        Examples
+        --------
+
+        Use a seeded generator for the parameter draws:
+
+        >>> set_rng(np.random.default_rng(2378))
+
+        Revert to the legacy ``numpy.random`` functions:
+
+        >>> set_rng(None)
+
+        """
+        if rng is not None and not isinstance(rng, numpy.random.Generator):
+            raise ArgumentTypeErr('badarg', 'rng',
+                                  'a numpy.random.Generator or None')
+
+        self._rng = rng
+
     ###########################################################################
     # Optimization methods
     ###########################################################################
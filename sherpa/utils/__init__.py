@@ -154,16 +154,21 @@ class NoNewAttributesAfterInit():
         object.__delattr__(self, name)
 
     def __setattr__(self, name, val):
-        if self.__initialized and (not hasattr(self, name)):
-            raise AttributeError("'%s' object has no attribute '%s'" %
-                                 (type(self).__name__, name))
+        if self.__initialized:
+            # Only look up the current value once, as it may be a
+            # property.
+            #
+            try:
+                oldval = getattr(self, name)
+            except AttributeError:
+                raise AttributeError("'%s' object has no attribute '%s'" %
+                                     (type(self).__name__, name)) from None
 
-        if self.__initialized and hasattr(self, name):
-            if callable(getattr(self, name)) and not callable(val):
+            if callable(oldval) and not callable(val):
                 raise AttributeError(("'%s' object attribute '%s' cannot be " +
                                       "replaced with a non-callable attribute")
                                      % (type(self).__name__, name))
-            elif not callable(getattr(self, name)) and callable(val):
+            elif not callable(oldval) and callable(val):
                 raise AttributeError(("'%s' object attribute '%s' cannot be " +
                                       "replaced with a callable attribute") %
                                      (type(self).__name__, name))
@@ -17,6 +17,7 @@
 #  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
+from functools import lru_cache
 import importlib
 import os
 import unittest
@@ -98,18 +99,24 @@ def get_datadir():
     return DATADIR
 
 
+# The check is made for every decorated test, so remember the result
+# (a failed import is not cached by Python, so it would be repeated).
+#
+@lru_cache(maxsize=None)
+def _has_package(package):
+    try:
+        importlib.import_module(package)
+        return True
+    except:
+        # We can have ImportError but also RuntimeErr
+        return False
+
+
 def has_package_from_list(*packages):
     """
     Returns True if at least one of the ``packages`` args is importable.
     """
-    for package in packages:
-        try:
-            importlib.import_module(package)
-            return True
-        except:
-            # We can have ImportError but also RuntimeErr
-            pass
-    return False
+    return any(_has_package(package) for package in packages)
 
 
 if HAS_PYTEST: